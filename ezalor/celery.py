@@ -23,6 +23,12 @@ app.conf.beat_schedule = {
         "task": "scraper.tasks.auto_create_posts_task",
         "schedule": crontab(hour="2,5,8,11,14,17,20,23", minute=30),
     },
+    # Executes every day.
+    "compacting_task_results": {
+        "name": "Compact task results",
+        "task": "scraper.tasks.compact_task_results_task",
+        "schedule": crontab(hour=4, minute=15),
+    },
 }
 
 # Load task modules from all registered Django apps.
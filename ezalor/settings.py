@@ -143,9 +143,99 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "America/Argentina/Cordoba"
 CELERY_ENABLE_UTC = True
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+# Results of tasks that ignore them are still stored when they fail. Old
+# results are rolled up and deleted by compact_task_results_task instead of
+# the built-in cleanup, which deletes them all at once.
+CELERY_TASK_STORE_ERRORS_EVEN_IF_IGNORED = True
+CELERY_RESULT_EXPIRES = None
 
 DATE_FORMAT = "d-m-Y"
 
+# Redis settings
+REDIS_URL = config("REDIS_URL", default=CELERY_BROKER_URL)
+REDIS_TIMEOUT = config("REDIS_TIMEOUT", default=5, cast=int)
+
+# Cache settings
+# Without Redis every process keeps its own in-memory cache, which the others
+# can't clear, so cached data may be stale in other processes for a while.
+CACHE_BACKEND = config(
+    "CACHE_BACKEND",
+    default=(
+        "django.core.cache.backends.redis.RedisCache"
+        if REDIS_URL.startswith(("redis://", "rediss://", "unix://"))
+        else "django.core.cache.backends.locmem.LocMemCache"
+    ),
+)
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": config(
+            "CACHE_LOCATION",
+            default=REDIS_URL if CACHE_BACKEND.endswith("RedisCache") else "",
+        ),
+    }
+}
+
+# HTTP client settings
+HTTP_POOL_CONNECTIONS = config("HTTP_POOL_CONNECTIONS", default=10, cast=int)
+HTTP_POOL_MAXSIZE = config("HTTP_POOL_MAXSIZE", default=10, cast=int)
+HTTP_TIMEOUT = config("HTTP_TIMEOUT", default=30, cast=int)
+HTTP_MAX_RETRIES = config("HTTP_MAX_RETRIES", default=3, cast=int)
+HTTP_RETRY_BACKOFF = config("HTTP_RETRY_BACKOFF", default=0.5, cast=float)
+
+# Graph API settings
+GRAPH_API_URL = config("GRAPH_API_URL", default="https://graph.facebook.com")
+FACEBOOK_BATCH_PUBLISHING = config("FACEBOOK_BATCH_PUBLISHING", default=True, cast=bool)
+PUBLISHING_CHUNK_SIZE = config("PUBLISHING_CHUNK_SIZE", default=10, cast=int)
+GRAPH_API_CALLS_PER_MINUTE = config("GRAPH_API_CALLS_PER_MINUTE", default=60, cast=int)
+GRAPH_API_BURST = config("GRAPH_API_BURST", default=10, cast=int)
+INSTAGRAM_CONTAINER_POLL_INTERVAL = config(
+    "INSTAGRAM_CONTAINER_POLL_INTERVAL", default=10, cast=int
+)
+INSTAGRAM_CONTAINER_MAX_POLLS = config(
+    "INSTAGRAM_CONTAINER_MAX_POLLS", default=30, cast=int
+)
+# Seconds after which a post still processing is taken as lost and retried.
+POST_PROCESSING_TIMEOUT = config("POST_PROCESSING_TIMEOUT", default=3600, cast=int)
+# Days before today whose articles are still published. Older pending posts,
+# e.g. of a page whose token broke days ago, are failed as expired instead.
+POST_MAX_AGE_DAYS = config("POST_MAX_AGE_DAYS", default=0, cast=int)
+
+# Scraper settings
+SCRAPER_MAX_WORKERS = config("SCRAPER_MAX_WORKERS", default=8, cast=int)
+SCRAPER_DETAIL_WORKERS = config("SCRAPER_DETAIL_WORKERS", default=4, cast=int)
+SCRAPER_MAX_REQUESTS_PER_HOST = config(
+    "SCRAPER_MAX_REQUESTS_PER_HOST", default=2, cast=int
+)
+SCRAPER_TIMEOUT = config("SCRAPER_TIMEOUT", default=30, cast=int)
+SCRAPER_TASK_TIME_LIMIT = config("SCRAPER_TASK_TIME_LIMIT", default=300, cast=int)
+SCRAPER_TASK_MAX_RETRIES = config("SCRAPER_TASK_MAX_RETRIES", default=3, cast=int)
+
+# Image settings
+# Public URL of the site, which the Graph API downloads the processed images
+# from. Publishing uses the original image URLs while it's not set.
+SITE_URL = config("SITE_URL", default="")
+IMAGE_MAX_BYTES = config("IMAGE_MAX_BYTES", default=20 * 1024 * 1024, cast=int)
+IMAGE_JPEG_QUALITY = config("IMAGE_JPEG_QUALITY", default=85, cast=int)
+# Seconds before an image that failed to download or read is tried again.
+IMAGE_FAILURE_TIMEOUT = config("IMAGE_FAILURE_TIMEOUT", default=6 * 60 * 60, cast=int)
+
+# Duplicate detection settings
+# Share of word pairs two articles of the same story have in common.
+DUPLICATE_MIN_SIMILARITY = config("DUPLICATE_MIN_SIMILARITY", default=0.5, cast=float)
+DUPLICATE_WINDOW_DAYS = config("DUPLICATE_WINDOW_DAYS", default=2, cast=int)
+
+# Task result settings
+# Days task results are kept before being rolled up into daily summaries.
+TASK_RESULT_RETENTION_DAYS = config("TASK_RESULT_RETENTION_DAYS", default=7, cast=int)
+TASK_RESULT_COMPACTION_BATCH_SIZE = config(
+    "TASK_RESULT_COMPACTION_BATCH_SIZE", default=1000, cast=int
+)
+
+# Metrics settings
+# Bearer token the metrics scraper must send. Metrics are not served without it.
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
 # For testing purposes
 if DEBUG:
     CELERY_ALWAYS_EAGER = True
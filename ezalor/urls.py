@@ -3,7 +3,10 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path
 
+from scraper.views import metrics_view
+
 urlpatterns = [
+    path("metrics", metrics_view, name="metrics"),
     path("", admin.site.urls),
 ]
 
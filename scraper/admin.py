@@ -1,23 +1,43 @@
 from django.contrib import admin, messages
+from django.contrib.admin.views.main import ORDER_VAR
 
+from scraper.cache import get_publishing_targets
 from scraper.models import (
     Article,
+    BackfillCheckpoint,
     FacebookPage,
     FacebookPost,
+    ImageAsset,
     InstagramPost,
     InstagramProfile,
     NewsPage,
+    TaskResultDailySummary,
 )
+from scraper.search import search_articles
 from scraper.tasks import create_facebook_post_task, create_instagram_post_task
 
 
-def create_facebook_posts(facebook_page: FacebookPage) -> tuple:
+@admin.action(description="Reanudar publicaciones")
+def reset_broken(modeladmin, request, queryset) -> None:
+    """
+    Admin action related to :model:`scraper.FacebookPage` and
+    :model:`scraper.InstagramProfile` to publish again to the selected
+    targets after fixing what broke them.
+    """
+
+    for publishing_target in queryset:
+        publishing_target.broken_at = None
+        publishing_target.broken_reason = ""
+        publishing_target.save(update_fields=["broken_at", "broken_reason"])
+
+
+def create_facebook_posts(facebook_page_id: int, facebook_page_name: str) -> tuple:
     """
     Admin action related to :model:`scraper.Article` to post selected
     articles in a specific :model:`scraper.FacebookPage`.
     """
 
-    name: str = f"facebook_post_{facebook_page}"
+    name: str = f"facebook_post_{facebook_page_name}"
 
     def create_facebook_posts_action(modeladmin, request, queryset):
         articles_id_list: list[int] = [article.id for article in queryset]
@@ -27,25 +47,27 @@ def create_facebook_posts(facebook_page: FacebookPage) -> tuple:
             messages.SUCCESS,
         )
         for article_id in articles_id_list:
-            create_facebook_post_task.delay(article_id, facebook_page.id)
+            create_facebook_post_task.delay(article_id, facebook_page_id)
 
     return (
         name,
         (
             create_facebook_posts_action,
             name,
-            f"Publicar en Facebook: {facebook_page.name}",
+            f"Publicar en Facebook: {facebook_page_name}",
         ),
     )
 
 
-def create_instagram_posts(instagram_profile: InstagramProfile) -> tuple:
+def create_instagram_posts(
+    instagram_profile_id: int, instagram_profile_name: str
+) -> tuple:
     """
     Admin action related to :model:`scraper.Article` to post selected
     articles in a specific :model:`scraper.InstagramProfile`.
     """
 
-    name: str = f"instagram_post_{instagram_profile}"
+    name: str = f"instagram_post_{instagram_profile_name}"
 
     def create_instagram_posts_action(modeladmin, request, queryset):
         articles_id_list: list[int] = [article.id for article in queryset]
@@ -55,14 +77,14 @@ def create_instagram_posts(instagram_profile: InstagramProfile) -> tuple:
             messages.SUCCESS,
         )
         for article_id in articles_id_list:
-            create_instagram_post_task.delay(article_id, instagram_profile.id)
+            create_instagram_post_task.delay(article_id, instagram_profile_id)
 
     return (
         name,
         (
             create_instagram_posts_action,
             name,
-            f"Publicar en Instagram: {instagram_profile.name}",
+            f"Publicar en Instagram: {instagram_profile_name}",
         ),
     )
 
@@ -87,24 +109,35 @@ class ArticleAdmin(admin.ModelAdmin):
         "news_page",
         "is_facebook",
         "is_instagram",
+        ("duplicate_of", admin.EmptyFieldListFilter),
     )
     list_display_links: tuple = ("id_number", "title")
-    search_fields: tuple = ("post_date", "title")
-    search_help_text: str = "Buscar por fecha de publicación o título."
+    search_fields: tuple = ("title", "body")
+    search_help_text: str = (
+        "Buscar por título, cuerpo o fecha de publicación (dd-mm-aaaa)."
+    )
+
+    def get_search_results(self, request, queryset, search_term) -> tuple:
+        if not search_term:
+            return queryset, False
+        queryset = search_articles(queryset, search_term)
+        if ORDER_VAR not in request.GET:
+            # Most relevant first, unless sorted by a column.
+            queryset = queryset.order_by("-search_rank", "-post_date", "-id")
+        return queryset, False
 
     def get_actions(self, request) -> dict:
         actions = super(ArticleAdmin, self).get_actions(request)  # If any
-        facebook_profile_list = FacebookPage.objects.all()
-        instagram_profile_list = InstagramProfile.objects.all()
+        publishing_targets: dict = get_publishing_targets()
         return {
             **actions,
             **dict(
-                create_facebook_posts(facebook_profile)
-                for facebook_profile in facebook_profile_list
+                create_facebook_posts(*facebook_page)
+                for facebook_page in publishing_targets["facebook_pages"]
             ),
             **dict(
-                create_instagram_posts(instagram_profile)
-                for instagram_profile in instagram_profile_list
+                create_instagram_posts(*instagram_profile)
+                for instagram_profile in publishing_targets["instagram_profiles"]
             ),
         }
 
@@ -120,10 +153,12 @@ class ArticleAdmin(admin.ModelAdmin):
                     "body",
                     "image",
                     ("is_facebook", "is_instagram"),
+                    ("duplicate_of", "image_asset"),
                 )
             },
         ),
     )
+    readonly_fields: tuple = ("duplicate_of", "image_asset")
 
     class FacebookPostInline(admin.TabularInline):
         model: FacebookPost = FacebookPost
@@ -149,6 +184,7 @@ class NewsPageAdmin(admin.ModelAdmin):
         "id",
         "name",
         "url",
+        "is_newest_first",
     )
     list_display_links: tuple = ("name",)
 
@@ -159,7 +195,12 @@ class FacebookPageAdmin(admin.ModelAdmin):
     Admin model related to :model:`scraper.FacebookPage`.
     """
 
-    pass
+    # List view.
+    list_display: tuple = ("name", "page_id", "broken_at")
+    actions: tuple = (reset_broken,)
+
+    # Add/change view.
+    readonly_fields: tuple = ("broken_at", "broken_reason")
 
 
 @admin.register(InstagramProfile)
@@ -168,7 +209,34 @@ class InstagramProfileAdmin(admin.ModelAdmin):
     Admin model related to :model:`scraper.InstagramProfile`.
     """
 
-    pass
+    # List view.
+    list_display: tuple = ("name", "user_id", "broken_at")
+    actions: tuple = (reset_broken,)
+
+    # Add/change view.
+    readonly_fields: tuple = ("broken_at", "broken_reason")
+
+
+@admin.register(ImageAsset)
+class ImageAssetAdmin(admin.ModelAdmin):
+    """
+    Admin model related to :model:`scraper.ImageAsset`.
+    """
+
+    # List view.
+    list_display: tuple = ("checksum", "source_url", "created_at")
+    list_display_links: tuple = ("checksum",)
+    search_fields: tuple = ("checksum", "source_url")
+    search_help_text: str = "Buscar por checksum o URL de origen."
+
+    # Add/change view.
+    readonly_fields: tuple = (
+        "checksum",
+        "source_url",
+        "facebook_image",
+        "instagram_image",
+        "created_at",
+    )
 
 
 @admin.register(FacebookPost)
@@ -182,10 +250,12 @@ class FacebookPostAdmin(admin.ModelAdmin):
         "article",
         "page",
         "post_date",
+        "status",
     )
     list_filter: tuple = (
         "page",
         "post_date",
+        "status",
     )
     list_display_links: tuple = ("article",)
     search_fields: tuple = ("post_date", "post_id")
@@ -203,11 +273,57 @@ class InstagramPostAdmin(admin.ModelAdmin):
         "article",
         "profile",
         "post_date",
+        "status",
     )
     list_filter: tuple = (
         "profile",
         "post_date",
+        "status",
     )
     list_display_links: tuple = ("article",)
     search_fields: tuple = ("post_date", "post_id")
     search_help_text: str = "Buscar por fecha o ID de publicación."
+
+
+@admin.register(TaskResultDailySummary)
+class TaskResultDailySummaryAdmin(admin.ModelAdmin):
+    """
+    Admin model related to :model:`scraper.TaskResultDailySummary`.
+    """
+
+    # List view.
+    list_display: tuple = ("day", "task_name", "status", "count")
+    list_filter: tuple = ("status", "task_name")
+    date_hierarchy: str = "day"
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+
+@admin.register(BackfillCheckpoint)
+class BackfillCheckpointAdmin(admin.ModelAdmin):
+    """
+    Admin model related to :model:`scraper.BackfillCheckpoint`.
+    """
+
+    # List view.
+    list_display: tuple = (
+        "news_page",
+        "since",
+        "until",
+        "first_page",
+        "last_page",
+        "next_page",
+        "created_articles",
+        "finished_at",
+    )
+    list_filter: tuple = ("news_page", ("finished_at", admin.EmptyFieldListFilter))
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
@@ -0,0 +1,101 @@
+from datetime import date
+
+from django.utils import timezone
+
+from scraper.custom_pickle import backfill_listing_page
+from scraper.models import BackfillCheckpoint, NewsPage
+
+
+def get_page_ranges(
+    news_page: NewsPage, pages_per_range: int, max_pages: int
+) -> list[tuple[int, int]]:
+    """
+    Return the first and last page of every range of listing pages of the
+    given :model:`scraper.NewsPage` to walk, only the first page if its
+    listing is not paginated.
+    """
+
+    if not news_page.pagination_url:
+        return [(1, 1)]
+    return [
+        (first_page, min(first_page + pages_per_range - 1, max_pages))
+        for first_page in range(1, max_pages + 1, pages_per_range)
+    ]
+
+
+def get_checkpoints(
+    news_page: NewsPage,
+    since: date,
+    until: date | None,
+    pages_per_range: int,
+    max_pages: int,
+) -> list[BackfillCheckpoint]:
+    """
+    Return the :model:`scraper.BackfillCheckpoint` instances of every range
+    of listing pages of the given :model:`scraper.NewsPage` for the date
+    range, creating them if there are none. Without an end date, the
+    unfinished backfill starting on the same date is resumed, today's
+    otherwise. Existing checkpoints keep their page ranges, so they never
+    overlap with a different number of pages per range.
+    """
+
+    checkpoints = BackfillCheckpoint.objects.filter(news_page=news_page, since=since)
+    if until is None:
+        unfinished_checkpoint: BackfillCheckpoint | None = (
+            checkpoints.filter(finished_at__isnull=True).order_by("-until").first()
+        )
+        until = unfinished_checkpoint.until if unfinished_checkpoint else date.today()
+    checkpoints_list: list[BackfillCheckpoint] = list(checkpoints.filter(until=until))
+    if checkpoints_list:
+        return checkpoints_list
+
+    for first_page, last_page in get_page_ranges(news_page, pages_per_range, max_pages):
+        checkpoint, _ = BackfillCheckpoint.objects.get_or_create(
+            news_page=news_page,
+            since=since,
+            until=until,
+            first_page=first_page,
+            defaults={"last_page": last_page, "next_page": first_page},
+        )
+        checkpoints_list.append(checkpoint)
+    return checkpoints_list
+
+
+def backfill_page_range(checkpoint: BackfillCheckpoint) -> int:
+    """
+    Walk the listing pages of the given :model:`scraper.BackfillCheckpoint`
+    from its next page, creating the missing articles of its date range and
+    saving the progress after every page. Once a page shows the following
+    ones can be skipped, the checkpoints of the later page ranges are
+    finished too, which stops them.
+    Return the number of created articles.
+    """
+
+    news_page: NewsPage = checkpoint.news_page
+    checkpoints = BackfillCheckpoint.objects.filter(
+        news_page=news_page, since=checkpoint.since, until=checkpoint.until
+    )
+    total_created: int = 0
+    while checkpoint.next_page <= checkpoint.last_page:
+        if checkpoints.filter(pk=checkpoint.pk, finished_at__isnull=False).exists():
+            return total_created
+
+        created, is_finished = backfill_listing_page(
+            news_page,
+            news_page.get_page_url(checkpoint.next_page),
+            checkpoint.since,
+            checkpoint.until,
+        )
+        total_created += created
+        checkpoint.created_articles += created
+        checkpoint.next_page += 1
+        checkpoint.save(update_fields=["created_articles", "next_page"])
+        if is_finished:
+            checkpoints.filter(
+                first_page__gt=checkpoint.first_page, finished_at__isnull=True
+            ).update(finished_at=timezone.now())
+            break
+
+    checkpoint.finished_at = timezone.now()
+    checkpoint.save(update_fields=["finished_at"])
+    return total_created
@@ -0,0 +1,173 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlsplit
+
+from scraper.benchmarks.synthetic import detail_html, get_post_date, listing_html
+from scraper.custom_pickle import fetch_url
+from scraper.models import NewsPage
+from scraper.parsers import ParsedArticle, parse_detail, parse_listing
+
+FIXTURES_DIR: Path = Path(__file__).resolve().parent / "fixtures"
+
+
+def get_versions() -> list[str]:
+    """
+    Return the recorded fixture versions, oldest first by their recording date
+    and then by name, as names like v10 sort before v2.
+    """
+
+    return sorted(
+        (path.parent.name for path in FIXTURES_DIR.glob("*/manifest.json")),
+        key=lambda version: (load_manifest(version)["recorded_on"], version),
+    )
+
+
+def load_manifest(version: str) -> dict:
+    """
+    Return the manifest of the given fixture version.
+    """
+
+    with open(FIXTURES_DIR / version / "manifest.json", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def get_origin(url: str) -> str:
+    """
+    Return the scheme and host of the given URL.
+    """
+
+    split_url = urlsplit(url)
+    return f"{split_url.scheme}://{split_url.netloc}"
+
+
+def get_listing_path(url: str) -> str:
+    """
+    Return the path, and query if any, of the given listing URL.
+    """
+
+    split_url = urlsplit(url)
+    return (split_url.path or "/") + (f"?{split_url.query}" if split_url.query else "")
+
+
+def recorded_site(
+    version: str, news_page_id: int, base_url: str
+) -> Callable[[str], str | None]:
+    """
+    Return a function resolving request paths to the recorded pages of a news
+    page, with links to the recorded site rewritten to base_url.
+    """
+
+    manifest: dict = load_manifest(version)
+    news_page: dict = manifest["news_pages"][str(news_page_id)]
+    origin: str = get_origin(news_page["url"])
+
+    def resolve(path: str) -> str | None:
+        file_name: str | None = news_page["pages"].get(path)
+        if file_name is None:
+            return None
+        page: str = (FIXTURES_DIR / version / file_name).read_text(encoding="utf-8")
+        return page.replace(origin, base_url)
+
+    return resolve
+
+
+def route_news_pages(
+    resolvers: dict[int, Callable[[str], str | None]],
+) -> Callable[[str], str | None]:
+    """
+    Return a function resolving "/news_page_<id>/<path>" requests with the
+    resolver of the given news page.
+    """
+
+    def resolve(path: str) -> str | None:
+        prefix, _, rest = path.lstrip("/").partition("/")
+        news_page_id: str = prefix.removeprefix("news_page_")
+        if not news_page_id.isdigit() or int(news_page_id) not in resolvers:
+            return None
+        return resolvers[int(news_page_id)](f"/{rest}")
+
+    return resolve
+
+
+def synthetic_site(
+    news_page_id: int,
+    articles_count: int,
+    today_count: int,
+    target_date: date,
+    base_url: str,
+) -> Callable[[str], str | None]:
+    """
+    Return a function resolving request paths to a synthetic listing with the
+    layout of the given news page, and its detail pages if any.
+    """
+
+    listing: str = listing_html(
+        news_page_id, articles_count, target_date, f"{base_url}/", today_count
+    )
+
+    def resolve(path: str) -> str | None:
+        if path == "/":
+            return listing
+        if news_page_id == 2 and path.startswith("/nota/"):
+            id_number: str = path.strip("/").split("/")[-1]
+            index: int = 100000 - int(id_number)
+            post_date: date = get_post_date(index, target_date, today_count)
+            return detail_html(id_number, post_date, f"{base_url}/")
+        return None
+
+    return resolve
+
+
+def record_fixtures(version: str, news_pages_list: list[NewsPage]) -> dict:
+    """
+    Download the listing, and detail pages if any, of the given
+    :model:`scraper.NewsPage` instances into a new fixture version.
+    Return its manifest.
+    """
+
+    version_dir: Path = FIXTURES_DIR / version
+    version_dir.mkdir(parents=True)
+    manifest: dict = {
+        "version": version,
+        "recorded_on": date.today().isoformat(),
+        "source": "Recorded from the live news pages.",
+        "news_pages": {},
+    }
+
+    for page in news_pages_list:
+        page_dir: str = f"news_page_{page.id}"
+        (version_dir / page_dir).mkdir()
+        listing: str = fetch_url(page.url)
+        (version_dir / page_dir / "listing.html").write_text(listing, encoding="utf-8")
+        pages: dict[str, str] = {get_listing_path(page.url): f"{page_dir}/listing.html"}
+
+        articles_list: list[ParsedArticle] = parse_listing(page, listing)
+        if page.id == 2:
+            details_list: list[ParsedArticle] = []
+            for index, article in enumerate(articles_list):
+                detail: str = fetch_url(article.url)
+                file_name: str = f"{page_dir}/detail_{index}.html"
+                (version_dir / file_name).write_text(detail, encoding="utf-8")
+                pages[get_listing_path(article.url)] = file_name
+                detail_article: ParsedArticle | None = parse_detail(
+                    page, article.url, detail
+                )
+                if detail_article is not None:
+                    details_list.append(detail_article)
+            articles_list = details_list
+
+        manifest["news_pages"][str(page.id)] = {
+            "name": page.name,
+            "url": page.url,
+            "articles": len(articles_list),
+            "today_articles": sum(
+                article.post_date == date.today() for article in articles_list
+            ),
+            "pages": pages,
+        }
+
+    with open(version_dir / "manifest.json", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, ensure_ascii=False)
+    return manifest
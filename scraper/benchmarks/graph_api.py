@@ -0,0 +1,216 @@
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qsl, urlsplit
+
+# Access token answered as expired, to simulate broken pages and profiles.
+EXPIRED_TOKEN: str = "expired"
+
+
+class FakeGraphAPI:
+    """
+    Local stand-in for the Graph API endpoints used by the publishing tasks,
+    with configurable latency, transient errors, per-target rate limits and
+    Instagram container processing time.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        calls_per_minute: int = 0,
+        container_delay: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls_per_minute = calls_per_minute
+        self.container_delay = container_delay
+        self.random = random.Random(seed)
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.calls: dict[str, deque] = defaultdict(deque)
+        self.containers: dict[str, float] = {}
+        self.counters: Counter = Counter()
+
+    def get_usage(self, target: str) -> int:
+        """
+        Register a call to the given target and return the percentage of its
+        per minute budget used, like the X-App-Usage call_count.
+        """
+
+        now: float = time.monotonic()
+        with self.lock:
+            calls: deque = self.calls[target]
+            calls.append(now)
+            while calls and calls[0] < now - 60:
+                calls.popleft()
+            if not self.calls_per_minute:
+                return 0
+            return len(calls) * 100 // self.calls_per_minute
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counters[name] += 1
+
+    def next_id(self) -> str:
+        with self.lock:
+            return str(next(self.ids))
+
+    def handle(self, method: str, path: str, params: dict) -> tuple[int, dict, dict]:
+        """
+        Return the status, headers and JSON body answering the given request.
+        """
+
+        parts: list[str] = [part for part in path.split("/") if part]
+        if method == "POST" and not parts and "batch" in params:
+            return self.handle_batch(params)
+        target: str = parts[0] if parts else ""
+        usage: int = self.get_usage(target)
+        headers: dict = {
+            "X-App-Usage": json.dumps(
+                {"call_count": usage, "total_cputime": usage, "total_time": usage}
+            )
+        }
+        self.count("requests")
+
+        if params.get("access_token") == EXPIRED_TOKEN:
+            self.count("expired_token")
+            return (
+                400,
+                headers,
+                self.error(
+                    "Error validating access token: Session has expired.",
+                    190,
+                    error_subcode=463,
+                ),
+            )
+        if self.calls_per_minute and usage > 100:
+            self.count("rate_limited")
+            return (
+                403,
+                headers,
+                self.error("(#32) Page request limit reached", 32, is_transient=True),
+            )
+        if self.random.random() < self.error_rate:
+            self.count("errors")
+            return (
+                500,
+                headers,
+                self.error(
+                    "An unexpected error has occurred. Please retry your request later.",
+                    2,
+                    is_transient=True,
+                ),
+            )
+
+        if method == "POST" and parts[1:] == ["photos"]:
+            self.count("photos")
+            post_id: str = self.next_id()
+            return 200, headers, {"id": post_id, "post_id": f"{target}_{post_id}"}
+        if method == "POST" and parts[1:] == ["media"]:
+            container_id: str = self.next_id()
+            with self.lock:
+                self.containers[container_id] = time.monotonic() + self.container_delay
+            self.count("containers")
+            return 200, headers, {"id": container_id}
+        if method == "POST" and parts[1:] == ["media_publish"]:
+            ready_at: float | None = self.containers.get(params.get("creation_id", ""))
+            if ready_at is None:
+                return 400, headers, self.error("Invalid parameter", 100)
+            if ready_at > time.monotonic():
+                self.count("not_ready")
+                return (
+                    400,
+                    headers,
+                    self.error(
+                        "Media ID is not available", 9007, error_subcode=2207027
+                    ),
+                )
+            self.count("published")
+            return 200, headers, {"id": self.next_id()}
+        if method == "GET" and target in self.containers:
+            ready_at = self.containers[target]
+            status: str = "FINISHED" if ready_at <= time.monotonic() else "IN_PROGRESS"
+            return 200, headers, {"id": target, "status_code": status}
+        if method == "DELETE" and target:
+            return 200, headers, {"success": True}
+        return 400, headers, self.error("Unsupported request", 100)
+
+    def handle_batch(self, params: dict) -> tuple[int, dict, list]:
+        """
+        Answer a batch request running each of its requests in turn.
+        """
+
+        self.count("batches")
+        responses_list: list[dict] = []
+        headers: dict = {}
+        for request in json.loads(params["batch"]):
+            relative_url = urlsplit(request["relative_url"])
+            request_params: dict = {"access_token": params.get("access_token")}
+            request_params.update(parse_qsl(relative_url.query))
+            request_params.update(parse_qsl(request.get("body", "")))
+            status, headers, body = self.handle(
+                request["method"], f"/{relative_url.path}", request_params
+            )
+            responses_list.append({"code": status, "body": json.dumps(body)})
+        return 200, headers, responses_list
+
+    @staticmethod
+    def error(message: str, code: int, **extra) -> dict:
+        return {
+            "error": {
+                "message": message,
+                "type": "OAuthException",
+                "code": code,
+                "fbtrace_id": "fake",
+                **extra,
+            }
+        }
+
+    def handler_class(self) -> type[BaseHTTPRequestHandler]:
+        """
+        Return a request handler answering with this fake Graph API.
+        """
+
+        graph_api: FakeGraphAPI = self
+
+        class GraphAPIHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def respond(self, method: str) -> None:
+                time.sleep(graph_api.latency)
+                split_path = urlsplit(self.path)
+                params: dict = dict(parse_qsl(split_path.query))
+                length: int = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    params.update(parse_qsl(self.rfile.read(length).decode()))
+                status, headers, body = graph_api.handle(
+                    method, split_path.path, params
+                )
+                content: bytes = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self) -> None:
+                self.respond("GET")
+
+            def do_POST(self) -> None:
+                self.respond("POST")
+
+            def do_DELETE(self) -> None:
+                self.respond("DELETE")
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return GraphAPIHandler
@@ -0,0 +1,133 @@
+from datetime import date, datetime
+
+from bs4 import BeautifulSoup, Tag
+
+from scraper.models import NewsPage
+from scraper.parsers import CNN_IMAGE_URL, ParsedArticle
+
+
+def get_article_id(news_page: NewsPage, article: Tag) -> str:
+    """
+    Search and return the news page's article ID depending on the
+    :model:`scraper.NewsPage`.
+    """
+
+    if news_page.id == 1:
+        filtered = filter(lambda x: x.startswith("post-"), article["class"])
+        for article_class in filtered:
+            return article_class[5:]
+    elif news_page.id == 2:
+        filtered = filter(lambda x: x.startswith("postid-"), article.body["class"])
+        for article_class in filtered:
+            return article_class[7:]
+    elif news_page.id == 3:
+        a_tag = article.find(class_="linkpreviewnoticia").a.get("href")
+        return a_tag.split("=")[-1]
+
+
+def get_listing_article_id(news_page: NewsPage, article: Tag) -> str | None:
+    """
+    Search and return the article ID from a listing entry of a
+    :model:`scraper.NewsPage` whose articles are completed from their detail
+    page. Return None when the listing does not expose it.
+    """
+
+    if news_page.id == 2:
+        article_classes: list[str] = article.get("class", [])
+        article_ids: list[str] = [article.get("id", "")]
+        filtered = filter(
+            lambda x: x.startswith("post-") and x[5:].isdigit(),
+            article_ids + article_classes,
+        )
+        for article_class in filtered:
+            return article_class[5:]
+    return None
+
+
+def get_article_post_date(news_page: NewsPage, article: Tag) -> date:
+    """
+    Search and return the news page's article post date depending on the
+    :model:`scraper.NewsPage`.
+    """
+
+    if news_page.id == 1:
+        post_date_tag: Tag = article.find(class_="elementor-post-date")
+        post_date_str: str = post_date_tag.get_text().strip()
+        return datetime.strptime(post_date_str, "%d/%m/%Y").date()
+    elif news_page.id == 2:
+        post_date_tag: Tag = article.find("span", class_="fecha")
+        post_date_str: str = post_date_tag.text
+        return datetime.strptime(post_date_str, "%d de %B, %Y").date()
+    elif news_page.id == 3:
+        post_date_str: str = article.text[:10]
+        return datetime.strptime(post_date_str, "%d/%m/%Y").date()
+
+
+def parse_listing(news_page: NewsPage, document: str) -> list[ParsedArticle]:
+    """
+    Parse the listing of the given :model:`scraper.NewsPage` walking the
+    BeautifulSoup tree.
+    """
+
+    soup = BeautifulSoup(document, "lxml")
+    articles_list: list[Tag] = soup.find_all("article")
+    parsed_articles_list: list[ParsedArticle] = []
+
+    if news_page.id == 1:
+        for article in articles_list:
+            parsed_articles_list.append(
+                ParsedArticle(
+                    id_number=get_article_id(news_page, article),
+                    url=article.find(class_="elementor-post__thumbnail__link").get(
+                        "href"
+                    ),
+                    title=article.h3.get_text().strip(),
+                    post_date=get_article_post_date(news_page, article),
+                    image=article.img.get("src"),
+                    body=article.p.get_text().strip(),
+                )
+            )
+
+    elif news_page.id == 2:
+        for article in articles_list:
+            parsed_articles_list.append(
+                ParsedArticle(
+                    id_number=get_listing_article_id(news_page, article),
+                    url=article.a.get("href"),
+                )
+            )
+
+    elif news_page.id == 3:
+        articles_list = soup.find_all(class_="titulopreviewnoticia")
+        for article in articles_list:
+            body_tag: Tag = article.next_sibling.next_sibling
+            parsed_articles_list.append(
+                ParsedArticle(
+                    id_number=get_article_id(news_page, body_tag),
+                    url=news_page.url[:34]
+                    + body_tag.find(class_="linkpreviewnoticia").a.get("href"),
+                    title=article.text[13:],
+                    post_date=get_article_post_date(news_page, article),
+                    image=CNN_IMAGE_URL,
+                    body=body_tag.find(class_="descripcionpreviewnoticia").p.text,
+                )
+            )
+
+    return parsed_articles_list
+
+
+def parse_detail(news_page: NewsPage, url: str, document: str) -> ParsedArticle:
+    """
+    Parse an article detail page of the given :model:`scraper.NewsPage`
+    walking the BeautifulSoup tree.
+    """
+
+    article_ = BeautifulSoup(document, "lxml")
+    return ParsedArticle(
+        id_number=get_article_id(news_page, article_),
+        url=url,
+        title=article_.h1.text,
+        post_date=get_article_post_date(news_page, article_),
+        image=article_.find("img", class_="attachment-post-thumbnail").get("data-src"),
+        body=article_.find(id="dslc-theme-content-inner").p.text,
+    )
@@ -0,0 +1,69 @@
+import multiprocessing
+from importlib import import_module
+from multiprocessing.connection import Connection
+from pathlib import Path
+
+PROC_DIR: Path = Path("/proc/self")
+
+
+def get_memory_status() -> dict[str, int]:
+    """
+    Return the current and peak resident set size of the current process in
+    bytes, as VmRSS and VmHWM.
+    """
+
+    with open(PROC_DIR / "status", encoding="utf-8") as file:
+        return {
+            line.split(":")[0]: int(line.split()[1]) * 1024
+            for line in file
+            if line.startswith(("VmRSS:", "VmHWM:"))
+        }
+
+
+def run_measured(function_path: str, args: tuple, connection: Connection) -> None:
+    """
+    Set up Django, call the function at the given dotted path with the given
+    arguments and send how many bytes the resident set size grew at its peak
+    through the given connection. Run in the measuring process.
+    """
+
+    import django
+
+    django.setup()
+    module_path, function_name = function_path.rsplit(".", 1)
+    function = getattr(import_module(module_path), function_name)
+    # Reset the peak to the current size, leaving out the start up.
+    with open(PROC_DIR / "clear_refs", "w", encoding="utf-8") as file:
+        file.write("5")
+    start_rss: int = get_memory_status()["VmRSS"]
+    function(*args)
+    connection.send(get_memory_status()["VmHWM"] - start_rss)
+
+
+def measure_peak_rss(function_path: str, *args) -> int:
+    """
+    Call the function at the given dotted path with the given arguments in a
+    new interpreter and return how many bytes its resident set size grew at
+    its peak. Unlike tracemalloc, it includes the memory of C extensions such
+    as lxml. The arguments must be picklable before Django is set up, so no
+    model instances. Linux only, as it reads /proc.
+    """
+
+    if not (PROC_DIR / "clear_refs").exists():
+        raise RuntimeError("Measuring peak memory needs the Linux /proc file system.")
+
+    context = multiprocessing.get_context("spawn")
+    parent_connection, child_connection = context.Pipe(duplex=False)
+    process = context.Process(
+        target=run_measured, args=(function_path, args, child_connection)
+    )
+    process.start()
+    child_connection.close()
+    try:
+        return parent_connection.recv()
+    except EOFError:
+        raise RuntimeError(
+            f"Measuring {function_path} failed with exit code {process.exitcode}."
+        ) from None
+    finally:
+        process.join()
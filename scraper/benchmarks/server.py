@@ -0,0 +1,55 @@
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator
+
+
+@contextmanager
+def serve(
+    handler_class: type[BaseHTTPRequestHandler],
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> Iterator[str]:
+    """
+    Run a local threaded HTTP server with the given handler while the wrapped
+    block runs, yielding its base URL. A random free port is used by default.
+    """
+
+    server = ThreadingHTTPServer((host, port), handler_class)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def get_pages_handler(
+    resolve: Callable[[str], str | None], latency: float = 0.0
+) -> type[BaseHTTPRequestHandler]:
+    """
+    Return a request handler standing in for the news pages, answering every
+    GET with the page returned by resolve for the request path, after the
+    given latency in seconds.
+    """
+
+    class PagesHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            page: str | None = resolve(self.path)
+            body: bytes = (page or "").encode()
+            self.send_response(200 if page is not None else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return PagesHandler
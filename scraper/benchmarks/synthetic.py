@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+
+from scraper.parsers import CNN_IMAGE_URL
+
+LOREM: str = (
+    "La Municipalidad informó que durante el fin de semana se realizarán "
+    "trabajos de mantenimiento en distintos barrios de la ciudad."
+)
+
+
+def get_post_date(index: int, post_date: date, today_count: int | None) -> date:
+    """
+    Return the post date of the listing entry at the given index, keeping the
+    first today_count entries on post_date and the rest on previous days.
+    """
+
+    if today_count is None or index < today_count:
+        return post_date
+    return post_date - timedelta(days=1 + (index - today_count) // 10)
+
+
+def listing_html(
+    news_page_id: int,
+    articles_count: int,
+    post_date: date,
+    base_url: str,
+    today_count: int | None = None,
+) -> str:
+    """
+    Return a listing page with the layout of the given news page holding
+    articles_count articles, newest first.
+    """
+
+    entries_list: list[str] = []
+    for index in range(articles_count):
+        id_number: int = 100000 - index
+        entry_date: date = get_post_date(index, post_date, today_count)
+        if news_page_id == 1:
+            entries_list.append(f"""
+<article class="elementor-post elementor-grid-item post-{id_number} post type-post status-publish">
+  <a class="elementor-post__thumbnail__link" href="{base_url}nota/{id_number}/">
+    <div class="elementor-post__thumbnail"><img width="800" height="450" src="{base_url}wp-content/uploads/{id_number}.jpg" alt=""></div>
+  </a>
+  <div class="elementor-post__text">
+    <h3 class="elementor-post__title"><a href="{base_url}nota/{id_number}/"> Noticia número {id_number} </a></h3>
+    <div class="elementor-post__meta-data"><span class="elementor-post-date"> {entry_date:%d/%m/%Y} </span></div>
+    <div class="elementor-post__excerpt"><p> {LOREM} </p></div>
+  </div>
+</article>""")
+        elif news_page_id == 2:
+            entries_list.append(f"""
+<article id="post-{id_number}" class="dslc-post dslc-blog-post post-{id_number} post type-post">
+  <div class="dslc-blog-post-thumb"><a href="{base_url}nota/{id_number}/"><img src="{base_url}wp-content/uploads/{id_number}-300x200.jpg" alt=""></a></div>
+  <div class="dslc-blog-post-title"><h2><a href="{base_url}nota/{id_number}/">Noticia número {id_number}</a></h2></div>
+  <div class="dslc-blog-post-excerpt">{LOREM}</div>
+</article>""")
+        elif news_page_id == 3:
+            entries_list.append(f"""
+<div class="titulopreviewnoticia">{entry_date:%d/%m/%Y} - Noticia número {id_number}</div>
+<div class="cuerpopreviewnoticia">
+  <div class="imagenpreviewnoticia"><img src="{CNN_IMAGE_URL}" alt=""></div>
+  <div class="descripcionpreviewnoticia"><p>{LOREM}</p></div>
+  <div class="linkpreviewnoticia"><a href="noticia.php?id={id_number}">Leer más</a></div>
+</div>""")
+
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head><meta charset="utf-8"><title>Noticias</title></head>
+<body class="home blog">
+<header><nav><ul><li><a href="{base_url}">Inicio</a></li><li><a href="{base_url}policiales/">Policiales</a></li></ul></nav></header>
+<main>{"".join(entries_list)}
+</main>
+<footer><p>Todos los derechos reservados.</p></footer>
+</body>
+</html>
+"""
+
+
+def detail_html(id_number: str, post_date: date, base_url: str) -> str:
+    """
+    Return an article detail page with the layout of news page 2.
+    """
+
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head><meta charset="utf-8"><title>Noticia número {id_number}</title></head>
+<body class="post-template-default single single-post postid-{id_number} single-format-standard">
+<header><nav><ul><li><a href="{base_url}">Inicio</a></li></ul></nav></header>
+<div id="dslc-content">
+  <h1>Noticia número {id_number}</h1>
+  <div class="dslc-tp-meta"><span class="fecha">{post_date:%d de %B, %Y}</span></div>
+  <div class="dslc-tp-thumbnail"><img class="attachment-post-thumbnail size-post-thumbnail lazyload" data-src="{base_url}wp-content/uploads/{id_number}.jpg" src="data:image/gif;base64,R0lGODlhAQABAAAAACw=" alt=""></div>
+  <div id="dslc-theme-content"><div id="dslc-theme-content-inner"><p>{LOREM}</p><p>{LOREM}</p><p>{LOREM}</p></div></div>
+</div>
+<footer><p>Todos los derechos reservados.</p></footer>
+</body>
+</html>
+"""
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from scraper.models import FacebookPage, InstagramProfile
+
+PUBLISHING_TARGETS_CACHE_KEY: str = "scraper:publishing_targets"
+PUBLISHING_TARGETS_CACHE_TIMEOUT: int = 60 * 60
+# Cache backends kept in the memory of each process. Clearing them only
+# clears the current process, e.g. a worker marking a page as broken leaves
+# the admin's copy stale, so they keep the targets for a short time only.
+LOCAL_CACHE_BACKENDS: tuple[str, ...] = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+LOCAL_PUBLISHING_TARGETS_CACHE_TIMEOUT: int = 60
+
+
+def get_publishing_targets() -> dict[str, list[tuple[int, str]]]:
+    """
+    Return the ID and name of every working :model:`scraper.FacebookPage` and
+    :model:`scraper.InstagramProfile`, cached until any of them changes, or
+    for up to a minute with a cache backend that isn't shared by processes.
+    """
+
+    publishing_targets: dict | None = cache.get(PUBLISHING_TARGETS_CACHE_KEY)
+    if publishing_targets is None:
+        publishing_targets = {
+            "facebook_pages": list(
+                FacebookPage.objects.filter(broken_at__isnull=True).values_list(
+                    "id", "name"
+                )
+            ),
+            "instagram_profiles": list(
+                InstagramProfile.objects.filter(broken_at__isnull=True).values_list(
+                    "id", "name"
+                )
+            ),
+        }
+        cache.set(
+            PUBLISHING_TARGETS_CACHE_KEY,
+            publishing_targets,
+            (
+                LOCAL_PUBLISHING_TARGETS_CACHE_TIMEOUT
+                if settings.CACHES["default"]["BACKEND"] in LOCAL_CACHE_BACKENDS
+                else PUBLISHING_TARGETS_CACHE_TIMEOUT
+            ),
+        )
+    return publishing_targets
+
+
+def clear_publishing_targets() -> None:
+    """
+    Drop the cached publishing targets, so they are read again on next use.
+    """
+
+    cache.delete(PUBLISHING_TARGETS_CACHE_KEY)
@@ -1,126 +1,342 @@
-import locale
-from datetime import date, datetime
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict
+from datetime import date
+from itertools import takewhile
+from urllib.parse import urlsplit
 
-import requests
-from bs4 import BeautifulSoup, Tag
+from django.conf import settings
+from django.db import transaction
 
+from scraper.duplicates import (
+    create_fingerprint_bands,
+    mark_duplicates,
+    set_fingerprint,
+)
+from scraper.http_client import get_session
+from scraper.instrumentation import phase
 from scraper.models import Article, NewsPage
+from scraper.parsers import ParsedArticle, is_past, parse_detail, parse_listing
 
-locale.setlocale(locale.LC_TIME, "es_AR.UTF-8")
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
 
 
-def get_article_id(news_page: NewsPage, article: Tag) -> str:
+def get_host_semaphore(url: str) -> threading.BoundedSemaphore:
     """
-    Search and return the news page's article ID depending on the
-    :model:`scraper.NewsPage`.
+    Return the semaphore limiting concurrent requests to the URL's host.
     """
 
-    if news_page.id == 1:
-        filtered = filter(lambda x: x.startswith("post-"), article["class"])
-        for article_class in filtered:
-            return article_class[5:]
-    elif news_page.id == 2:
-        filtered = filter(lambda x: x.startswith("postid-"), article.body["class"])
-        for article_class in filtered:
-            return article_class[7:]
-    elif news_page.id == 3:
-        a_tag = article.find(class_="linkpreviewnoticia").a.get("href")
-        return a_tag.split("=")[-1]
+    host: str = urlsplit(url).netloc
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(
+                settings.SCRAPER_MAX_REQUESTS_PER_HOST
+            )
+        return _host_semaphores[host]
 
 
-def get_article_post_date(news_page: NewsPage, article: Tag) -> date:
+def fetch_url(url: str) -> str:
     """
-    Search and return the news page's article post date depending on the
-    :model:`scraper.NewsPage`.
+    Download the given URL and return its text, never exceeding the
+    per-host concurrency limit.
     """
 
-    if news_page.id == 1:
-        post_date_tag: Tag = article.find(class_="elementor-post-date")
-        post_date_str: str = post_date_tag.get_text().strip()
-        return datetime.strptime(post_date_str, "%d/%m/%Y").date()
-    elif news_page.id == 2:
-        post_date_tag: Tag = article.find("span", class_="fecha")
-        post_date_str: str = post_date_tag.text
-        return datetime.strptime(post_date_str, "%d de %B, %Y").date()
-    elif news_page.id == 3:
-        post_date_str: str = article.text[:10]
-        return datetime.strptime(post_date_str, "%d/%m/%Y").date()
+    with get_host_semaphore(url), phase("detail_fetch"):
+        get_request = get_session().get(url=url, timeout=settings.SCRAPER_TIMEOUT)
+    return get_request.text
 
 
-def fetch_new_articles() -> int:
+def fetch_listing(page: NewsPage) -> tuple[str | None, dict]:
     """
-    Search all :model:`scraper.NewsPage` and create a new :model:`scraper.Article`
-    instance if new depending on the news page.
+    Conditionally download the listing of the given :model:`scraper.NewsPage`
+    using the validators stored from its last response.
+    Return a tuple with the listing HTML, or None if it has not changed, and
+    the validators to store once the listing is processed.
+    """
+
+    headers: dict = {}
+    if page.etag:
+        headers["If-None-Match"] = page.etag
+    if page.last_modified:
+        headers["If-Modified-Since"] = page.last_modified
+
+    with get_host_semaphore(page.url), phase("listing_fetch"):
+        get_request = get_session().get(
+            url=page.url, headers=headers, timeout=settings.SCRAPER_TIMEOUT
+        )
+    if get_request.status_code == 304:
+        return None, {}
+
+    validators: dict = {
+        "etag": get_request.headers.get("ETag", ""),
+        "last_modified": get_request.headers.get("Last-Modified", ""),
+        "content_hash": hashlib.sha256(get_request.content).hexdigest(),
+    }
+    if validators["content_hash"] == page.content_hash:
+        return None, validators
+    return get_request.text, validators
+
+
+def fetch_detail_pages(urls_list: list[str]) -> list[tuple[str, str]]:
+    """
+    Download the given article detail pages concurrently and return a list of
+    (url, html) tuples in the same order.
+    """
+
+    if not urls_list:
+        return []
+    with ThreadPoolExecutor(max_workers=settings.SCRAPER_DETAIL_WORKERS) as executor:
+        return list(zip(urls_list, executor.map(fetch_url, urls_list)))
+
+
+def fetch_detail_articles(
+    page: NewsPage, urls_list: list[str], since: date
+) -> list[ParsedArticle]:
+    """
+    Download and parse the given article detail pages of a
+    :model:`scraper.NewsPage`. Detail pages of news pages listed newest first
+    are downloaded in batches, stopping at the first article older than since.
+    """
+
+    batch_size: int = (
+        settings.SCRAPER_DETAIL_WORKERS if page.is_newest_first else len(urls_list)
+    )
+    parsed_articles_list: list[ParsedArticle] = []
+    for start in range(0, len(urls_list), max(batch_size, 1)):
+        batch_urls_list: list[str] = urls_list[start : start + batch_size]
+        for article_url, article_html in fetch_detail_pages(batch_urls_list):
+            with phase("parse"):
+                article: ParsedArticle | None = parse_detail(
+                    page, article_url, article_html
+                )
+            if article is None:
+                continue
+            if is_past(page, article, since):
+                return parsed_articles_list
+            parsed_articles_list.append(article)
+    return parsed_articles_list
+
+
+def get_existing_ids(page: NewsPage, id_numbers_list: list[str]) -> set[str]:
+    """
+    Return which of the given ID numbers already belong to a
+    :model:`scraper.Article` of the given :model:`scraper.NewsPage`.
+    """
+
+    return set(
+        Article.objects.filter(
+            news_page=page, id_number__in=id_numbers_list
+        ).values_list("id_number", flat=True)
+    )
+
+
+def bulk_create_articles(page: NewsPage, articles_list: list[Article]) -> int:
+    """
+    Insert the given unsaved :model:`scraper.Article` instances of a
+    :model:`scraper.NewsPage` in a single query, skipping those already stored,
+    and mark the ones telling the same story as another article as duplicates.
+    The news page row is locked meanwhile, so concurrent tasks of the same page
+    insert one at a time.
+    Return the number of created articles.
+    """
+
+    new_articles: dict[str, Article] = {}
+    for article in articles_list:
+        new_articles.setdefault(article.id_number, article)
+    existing_ids: set[str] = get_existing_ids(page, list(new_articles))
+    new_ids_list: list[str] = [
+        id_number for id_number in new_articles if id_number not in existing_ids
+    ]
+    if not new_ids_list:
+        return 0
+
+    for id_number in new_ids_list:
+        set_fingerprint(new_articles[id_number])
+    with transaction.atomic():
+        # Under READ COMMITTED a concurrent task could otherwise commit some of
+        # these articles between the insert and the select below, and they
+        # would be counted and fingerprinted twice.
+        NewsPage.objects.select_for_update().filter(pk=page.pk).exists()
+        existing_ids = get_existing_ids(page, new_ids_list)
+        new_ids_list = [
+            id_number for id_number in new_ids_list if id_number not in existing_ids
+        ]
+        if not new_ids_list:
+            return 0
+
+        Article.objects.bulk_create(
+            [new_articles[id_number] for id_number in new_ids_list],
+            ignore_conflicts=True,
+        )
+        new_articles_list: list[Article] = list(
+            Article.objects.filter(news_page=page, id_number__in=new_ids_list)
+        )
+        create_fingerprint_bands(new_articles_list)
+    # Once committed, so concurrent news page tasks see each other's articles.
+    mark_duplicates(new_articles_list)
+    return len(new_articles_list)
+
+
+def get_detail_urls(page: NewsPage, articles_list: list[ParsedArticle]) -> list[str]:
+    """
+    Return the detail page URLs of the given listed articles of a
+    :model:`scraper.NewsPage`, leaving out those already stored.
+    """
+
+    existing_ids: set[str] = get_existing_ids(
+        page, [article.id_number for article in articles_list if article.id_number]
+    )
+    return list(
+        dict.fromkeys(
+            article.url
+            for article in articles_list
+            if article.id_number is None or article.id_number not in existing_ids
+        )
+    )
+
+
+def create_page_articles(page: NewsPage, html: str, target_date: date) -> int:
+    """
+    Parse the listing HTML of the given :model:`scraper.NewsPage` and create
+    a new :model:`scraper.Article` instance for every new article posted on
+    the target date.
+    Return the number of created articles.
+    """
+
+    with phase("parse"):
+        parsed_articles_list: list[ParsedArticle] = parse_listing(
+            page, html, target_date
+        )
+    if page.id == 2:
+        parsed_articles_list = fetch_detail_articles(
+            page, get_detail_urls(page, parsed_articles_list), target_date
+        )
+
+    with phase("db_write"):
+        return bulk_create_articles(
+            page,
+            [
+                Article(news_page=page, **asdict(article))
+                for article in parsed_articles_list
+                if article.post_date == target_date
+            ],
+        )
+
+
+def save_page_articles(
+    page: NewsPage, listing: tuple[str | None, dict], target_date: date
+) -> int:
+    """
+    Create the new articles of a :model:`scraper.NewsPage` from its fetched
+    listing and store the listing validators.
+    Return the number of created articles.
+    """
+
+    total_created: int = 0
+    html, validators = listing
+    if html is not None:
+        total_created = create_page_articles(page, html, target_date)
+    if validators:
+        NewsPage.objects.filter(pk=page.pk).update(**validators)
+    return total_created
+
+
+def fetch_news_page_articles(page: NewsPage, target_date: date | None = None) -> int:
+    """
+    Search a single :model:`scraper.NewsPage` and create a new
+    :model:`scraper.Article` instance for every new article posted on the
+    target date, today by default.
+    Return the number of created articles.
+    """
+
+    return save_page_articles(page, fetch_listing(page), target_date or date.today())
+
+
+def fetch_new_articles(
+    target_date: date | None = None, news_page_ids_list: list[int] | None = None
+) -> int:
+    """
+    Search all :model:`scraper.NewsPage`, or only the given ones, and create a
+    new :model:`scraper.Article` instance if new depending on the news page,
+    for articles posted on the target date, today by default.
+    Listing pages are downloaded concurrently, so a scrape cycle takes as long
+    as the slowest news page instead of the sum of all of them, and listings
+    that did not change since the last run are not parsed again.
     Return the number of created articles.
     """
 
     total_created: int = 0
+    target_date = target_date or date.today()
 
-    for page in NewsPage.objects.all():
-        get_request = requests.get(url=page.url)
-        soup = BeautifulSoup(get_request.text, "lxml")
-        articles_list: list[Tag] = soup.find_all("article")
-        if page.id == 1:
-            for article in articles_list:
-                if get_article_post_date(page, article) == date.today():
-                    a, created = Article.objects.get_or_create(
-                        id_number=get_article_id(page, article),
-                        news_page=page,
-                        defaults={
-                            "url": article.find(
-                                class_="elementor-post__thumbnail__link"
-                            ).get("href"),
-                            "title": article.h3.get_text().strip(),
-                            "post_date": date.today(),
-                            "image": article.img.get("src"),
-                            "body": article.p.get_text().strip(),
-                        },
-                    )
-                    if created:
-                        total_created += 1
-
-        elif page.id == 2:
-            for article in articles_list:
-                article_url: str = article.a.get("href")
-                article_request = requests.get(url=article_url)
-                article_ = BeautifulSoup(article_request.text, "lxml")
-                if get_article_post_date(page, article_) == date.today():
-                    a, created = Article.objects.get_or_create(
-                        id_number=get_article_id(page, article_),
-                        news_page=page,
-                        defaults={
-                            "url": article_url,
-                            "title": article_.h1.text,
-                            "post_date": date.today(),
-                            "image": article_.find(
-                                "img", class_="attachment-post-thumbnail"
-                            ).get("data-src"),
-                            "body": article_.find(id="dslc-theme-content-inner").p.text,
-                        },
-                    )
-                    if created:
-                        total_created += 1
-
-        elif page.id == 3:
-            articles_list: list[Tag] = soup.find_all(class_="titulopreviewnoticia")
-            for article in articles_list:
-                body_tag: Tag = article.next_sibling.next_sibling
-                if get_article_post_date(page, article) == date.today():
-                    a, created = Article.objects.get_or_create(
-                        id_number=get_article_id(page, body_tag),
-                        news_page=page,
-                        defaults={
-                            "url": page.url[:34]
-                            + body_tag.find(class_="linkpreviewnoticia").a.get("href"),
-                            "title": article.text[13:],
-                            "post_date": date.today(),
-                            "image": "https://i.postimg.cc/vB77SY4G/RECUADRO-NOTICIA-CNN.png",
-                            "body": body_tag.find(
-                                class_="descripcionpreviewnoticia"
-                            ).p.text,
-                        },
-                    )
-                    if created:
-                        total_created += 1
+    news_pages = NewsPage.objects.all()
+    if news_page_ids_list is not None:
+        news_pages = news_pages.filter(id__in=news_page_ids_list)
+    news_pages_list: list[NewsPage] = list(news_pages)
+    with ThreadPoolExecutor(max_workers=settings.SCRAPER_MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(fetch_listing, page): page for page in news_pages_list
+        }
+        for future in as_completed(futures):
+            total_created += save_page_articles(
+                futures[future], future.result(), target_date
+            )
 
     return total_created
+
+
+def fetch_listing_page(url: str) -> str | None:
+    """
+    Download the given listing page, or return None if it doesn't exist,
+    which is the case past the last page of a paginated listing.
+    """
+
+    with get_host_semaphore(url), phase("listing_fetch"):
+        get_request = get_session().get(url=url, timeout=settings.SCRAPER_TIMEOUT)
+    if get_request.status_code == 404:
+        return None
+    get_request.raise_for_status()
+    return get_request.text
+
+
+def backfill_listing_page(
+    page: NewsPage, url: str, since: date, until: date
+) -> tuple[int, bool]:
+    """
+    Create the missing :model:`scraper.Article` instances of a listing page of
+    the given :model:`scraper.NewsPage` posted from since to until.
+    Return the number of created articles, and whether the following listing
+    pages can be skipped, because this one is empty or, being listed newest
+    first, reaches an article older than since.
+    """
+
+    html: str | None = fetch_listing_page(url)
+    if html is None:
+        return 0, True
+    with phase("parse"):
+        listed_articles_list: list[ParsedArticle] = parse_listing(page, html)
+    if not listed_articles_list:
+        return 0, True
+
+    parsed_articles_list: list[ParsedArticle] = list(
+        takewhile(
+            lambda article: not is_past(page, article, since), listed_articles_list
+        )
+    )
+    is_finished: bool = len(parsed_articles_list) < len(listed_articles_list)
+    if page.id == 2:
+        detail_urls_list: list[str] = get_detail_urls(page, parsed_articles_list)
+        parsed_articles_list = fetch_detail_articles(page, detail_urls_list, since)
+        is_finished = is_finished or len(parsed_articles_list) < len(detail_urls_list)
+
+    with phase("db_write"):
+        created: int = bulk_create_articles(
+            page,
+            [
+                Article(news_page=page, **asdict(article))
+                for article in parsed_articles_list
+                if article.post_date is not None and since <= article.post_date <= until
+            ],
+        )
+    return created, is_finished
@@ -0,0 +1,234 @@
+import hashlib
+import re
+import struct
+import unicodedata
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+
+from scraper.models import Article, FingerprintBand
+
+# MinHash signatures of PERMUTATIONS values, split in BANDS bands of ROWS
+# values. Articles sharing a whole band are compared, which finds those with
+# half their shingles in common almost always, and few others.
+PERMUTATIONS: int = 32
+BANDS: int = 16
+ROWS: int = PERMUTATIONS // BANDS
+VALUE_BITS: int = 56
+STOP_WORDS: frozenset = frozenset(
+    "al como con de del el en es esta la las lo los mas para pero por que se "
+    "sin su sus un una y".split()
+)
+
+
+def get_hash(value: bytes) -> int:
+    """
+    Return a stable 64-bit hash of the given bytes, the same in every process.
+    """
+
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+
+
+def get_words(text: str) -> list[str]:
+    """
+    Return the words of the given text in lower case and without accents,
+    leaving out the Spanish stop words.
+    """
+
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [word for word in re.findall(r"\w+", text) if word not in STOP_WORDS]
+
+
+def get_shingles(title: str, body: str) -> set[str]:
+    """
+    Return the pairs of consecutive words of the given article title and body.
+    """
+
+    words_list: list[str] = get_words(f"{title} {body}")
+    if len(words_list) < 2:
+        return set(words_list)
+    return {
+        f"{word} {next_word}" for word, next_word in zip(words_list, words_list[1:])
+    }
+
+
+def get_fingerprint(title: str, body: str) -> bytes | None:
+    """
+    Return the MinHash signature of the given article title and body, or None
+    if it has no words. The share of equal values of two signatures estimates
+    the share of shingles their articles have in common.
+    Every shingle is hashed once and kept as the minimum of one of the
+    signature bins if lower, and empty bins borrow the value of the next bin
+    that is not, which is as accurate as hashing it once per bin.
+    """
+
+    signature: list[int | None] = [None] * PERMUTATIONS
+    for shingle in get_shingles(title, body):
+        shingle_hash: int = get_hash(shingle.encode())
+        index: int = shingle_hash % PERMUTATIONS
+        value: int = shingle_hash >> 8 & (1 << VALUE_BITS) - 1
+        if signature[index] is None or value < signature[index]:
+            signature[index] = value
+    if all(value is None for value in signature):
+        return None
+
+    for index in range(PERMUTATIONS):
+        offset: int = 1
+        while signature[index] is None:
+            borrowed: int | None = signature[(index + offset) % PERMUTATIONS]
+            if borrowed is not None and borrowed < 1 << VALUE_BITS:
+                signature[index] = borrowed + (offset << VALUE_BITS)
+            offset += 1
+    return struct.pack(f">{PERMUTATIONS}Q", *signature)
+
+
+def get_signature(fingerprint: bytes) -> tuple[int, ...]:
+    """
+    Return the MinHash signature values packed in the given fingerprint.
+    """
+
+    return struct.unpack(f">{PERMUTATIONS}Q", fingerprint)
+
+
+def get_band_values(fingerprint: bytes) -> list[int]:
+    """
+    Return the hash of every band of the given fingerprint, including the band
+    position, as signed integers to fit a bigint column.
+    """
+
+    signature: tuple[int, ...] = get_signature(fingerprint)
+    values_list: list[int] = []
+    for band in range(BANDS):
+        value: int = get_hash(
+            struct.pack(f">H{ROWS}Q", band, *signature[band * ROWS : (band + 1) * ROWS])
+        )
+        values_list.append(value - (1 << 64) if value >= 1 << 63 else value)
+    return values_list
+
+
+def get_similarity(signature: tuple[int, ...], other_signature: tuple) -> float:
+    """
+    Return the share of equal values of the given signatures, from 0 to 1.
+    """
+
+    return (
+        sum(
+            value == other_value
+            for value, other_value in zip(signature, other_signature)
+        )
+        / PERMUTATIONS
+    )
+
+
+def set_fingerprint(article: Article) -> None:
+    """
+    Set the fingerprint of the given :model:`scraper.Article` from its title
+    and body, without saving it.
+    """
+
+    article.fingerprint = get_fingerprint(article.title, article.body)
+
+
+def create_fingerprint_bands(articles_list: list[Article]) -> None:
+    """
+    Store the fingerprint bands of the given stored :model:`scraper.Article`
+    instances, which is how their near-duplicates find them.
+    """
+
+    FingerprintBand.objects.bulk_create(
+        (
+            FingerprintBand(article_id=article.id, band=band, value=value)
+            for article in articles_list
+            if article.fingerprint is not None
+            for band, value in enumerate(get_band_values(article.fingerprint))
+        ),
+        ignore_conflicts=True,
+    )
+
+
+def delete_old_fingerprint_bands(today: date) -> int:
+    """
+    Delete the fingerprint bands of the articles too old to be compared with
+    new ones. Return the number of deleted bands.
+    """
+
+    window = timedelta(days=settings.DUPLICATE_WINDOW_DAYS)
+    deleted, _ = FingerprintBand.objects.filter(
+        article__post_date__lt=today - window
+    ).delete()
+    return deleted
+
+
+def mark_duplicates(articles_list: list[Article]) -> int:
+    """
+    Link each of the given stored :model:`scraper.Article` instances with a
+    near-duplicate posted earlier around the same date to the earliest article
+    of that story, which is left as the only one to publish.
+    Candidates are looked up by equal fingerprint bands and compared in
+    memory, so no article is compared with the whole table.
+    Return the number of articles marked as duplicates.
+    """
+
+    articles_list = [
+        article for article in articles_list if article.fingerprint is not None
+    ]
+    if not articles_list:
+        return 0
+
+    band_values: dict[int, list[int]] = {
+        article.id: get_band_values(article.fingerprint) for article in articles_list
+    }
+    window = timedelta(days=settings.DUPLICATE_WINDOW_DAYS)
+    post_dates_list: list[date] = [article.post_date for article in articles_list]
+    fingerprint_bands = FingerprintBand.objects.filter(
+        value__in={
+            value for values_list in band_values.values() for value in values_list
+        },
+        article__post_date__range=(
+            min(post_dates_list) - window,
+            max(post_dates_list) + window,
+        ),
+        article__duplicate_of__isnull=True,
+    ).values_list(
+        "value", "article_id", "article__fingerprint", "article__duplicate_of_id"
+    )
+    candidates: dict[int, list] = {}
+    candidate_ids: dict[int, set[int]] = defaultdict(set)
+    for value, article_id, fingerprint, duplicate_of_id in fingerprint_bands:
+        if article_id not in candidates:
+            candidates[article_id] = [get_signature(fingerprint), duplicate_of_id]
+        candidate_ids[value].add(article_id)
+
+    # Only the given articles are marked, each as a duplicate of the earliest
+    # story it matches, so a new article resembling two stories never merges
+    # them. Earlier articles only, so no two articles point at each other.
+    original_ids: dict[int, int] = {}
+    for article in sorted(articles_list, key=lambda article: article.id):
+        if article.id not in candidates or candidates[article.id][1] is not None:
+            continue
+        signature: tuple[int, ...] = candidates[article.id][0]
+        story_ids_list: list[int] = [
+            article_id
+            for article_id in set().union(
+                *(candidate_ids[value] for value in band_values[article.id])
+            )
+            if article_id < article.id
+            and candidates[article_id][1] is None
+            and get_similarity(signature, candidates[article_id][0])
+            >= settings.DUPLICATE_MIN_SIMILARITY
+        ]
+        if story_ids_list:
+            candidates[article.id][1] = min(story_ids_list)
+            original_ids[article.id] = min(story_ids_list)
+
+    Article.objects.bulk_update(
+        (
+            Article(id=article_id, duplicate_of_id=original_id)
+            for article_id, original_id in original_ids.items()
+        ),
+        ("duplicate_of",),
+        batch_size=500,
+    )
+    return len(original_ids)
@@ -0,0 +1,99 @@
+import json
+
+import requests
+
+# Graph API error codes, see
+# https://developers.facebook.com/docs/graph-api/guides/error-handling
+MEDIA_NOT_READY_CODE: int = 9007
+TRANSIENT_CODES: frozenset = frozenset({1, 2, MEDIA_NOT_READY_CODE})
+RATE_LIMIT_CODES: frozenset = frozenset({4, 17, 32, 341, 368, 613})
+TOKEN_CODES: frozenset = frozenset({10, 102, 190})
+
+
+class GraphAPIError(Exception):
+    """
+    Error answered by the Graph API.
+    """
+
+    def __init__(self, message: str, code: int | None = None, subcode=None) -> None:
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.subcode = subcode
+
+
+class TransientGraphAPIError(GraphAPIError):
+    """
+    Error that may not happen again if the same request is retried later.
+    """
+
+
+class RateLimitedGraphAPIError(TransientGraphAPIError):
+    """
+    Error answered while the app, page or profile call budget is used up.
+    """
+
+
+class PermanentGraphAPIError(GraphAPIError):
+    """
+    Error that will happen again for the same request, like an invalid image.
+    """
+
+
+class TokenGraphAPIError(PermanentGraphAPIError):
+    """
+    Error caused by an expired, revoked or insufficient access token, which
+    will happen again for every request sent with it.
+    """
+
+
+def get_error_class(error_dict: dict, status: int = 400) -> type[GraphAPIError]:
+    """
+    Return the class matching the given Graph API error and HTTP status.
+    """
+
+    code: int = int(error_dict.get("code") or 0)
+    if code in RATE_LIMIT_CODES or 80000 < code < 80100:
+        return RateLimitedGraphAPIError
+    if code in TOKEN_CODES or 200 <= code < 300:
+        return TokenGraphAPIError
+    if code in TRANSIENT_CODES or error_dict.get("is_transient") or status >= 500:
+        return TransientGraphAPIError
+    return PermanentGraphAPIError
+
+
+def get_error(response_dict: dict, status: int = 400) -> GraphAPIError | None:
+    """
+    Return the classified error of the given Graph API response, if any.
+    """
+
+    error_dict: dict | None = response_dict.get("error")
+    if not isinstance(error_dict, dict):
+        return None
+    return get_error_class(error_dict, status)(
+        error_dict.get("message") or "Unknown Graph API error.",
+        error_dict.get("code"),
+        error_dict.get("error_subcode"),
+    )
+
+
+def get_response(request: requests.Response) -> dict | list:
+    """
+    Return the decoded body of the given Graph API response, raising its
+    classified error if it failed.
+    """
+
+    try:
+        response: dict | list = json.loads(request.text)
+    except ValueError:
+        error_class: type[GraphAPIError] = (
+            TransientGraphAPIError
+            if request.status_code >= 500 or request.status_code == 429
+            else PermanentGraphAPIError
+        )
+        raise error_class(f"Invalid Graph API response ({request.status_code}).")
+    if isinstance(response, dict):
+        error: GraphAPIError | None = get_error(response, request.status_code)
+        if error is not None:
+            raise error
+    return response
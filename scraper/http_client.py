@@ -0,0 +1,81 @@
+import os
+import threading
+
+import requests
+from celery.signals import worker_process_init
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter applying a default timeout to requests sent without one.
+    """
+
+    def __init__(self, *args, timeout: float | None = None, **kwargs) -> None:
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def create_session() -> requests.Session:
+    """
+    Return a new session keeping connections alive in per-host pools, with
+    default timeouts and retries for idempotent requests.
+    """
+
+    retries = Retry(
+        total=settings.HTTP_MAX_RETRIES,
+        backoff_factor=settings.HTTP_RETRY_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(
+        timeout=settings.HTTP_TIMEOUT,
+        max_retries=retries,
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the HTTP session of the current process, creating it if needed.
+    Sessions are never shared with forked processes, so every Celery prefork
+    child opens its own connections.
+    """
+
+    global _session, _session_pid
+
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = create_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+@worker_process_init.connect(weak=False)
+def reset_session(**kwargs) -> None:
+    """
+    Forget the session inherited from the parent process when a Celery
+    prefork child starts.
+    """
+
+    global _session, _session_pid
+
+    with _session_lock:
+        _session = None
+        _session_pid = None
@@ -0,0 +1,202 @@
+import hashlib
+import logging
+from collections import defaultdict
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError
+from PIL import Image, ImageOps
+from requests import RequestException
+
+from scraper.http_client import get_session
+from scraper.models import Article, ImageAsset
+
+logger = logging.getLogger(__name__)
+
+# Facebook photos are shown at most 2048 pixels wide or high.
+FACEBOOK_MAX_SIZE: int = 2048
+# Instagram only accepts aspect ratios from 4:5 to 1.91:1, and resizes images
+# to between 320 and 1440 pixels wide.
+INSTAGRAM_MIN_RATIO: float = 4 / 5
+INSTAGRAM_MAX_RATIO: float = 1.91
+INSTAGRAM_MIN_WIDTH: int = 320
+INSTAGRAM_MAX_WIDTH: int = 1440
+FAILED_IMAGE_CACHE_KEY: str = "scraper:failed_image:{}"
+
+
+class ImageError(Exception):
+    """
+    Image that can't be downloaded or read.
+    """
+
+
+def download_image(url: str) -> bytes:
+    """
+    Download the image at the given URL, refusing those over the configured
+    size.
+    """
+
+    with get_session().get(
+        url, timeout=settings.SCRAPER_TIMEOUT, stream=True
+    ) as request:
+        request.raise_for_status()
+        content = bytearray()
+        for chunk in request.iter_content(chunk_size=64 * 1024):
+            content += chunk
+            if len(content) > settings.IMAGE_MAX_BYTES:
+                raise ImageError(f"Image over {settings.IMAGE_MAX_BYTES} bytes.")
+    return bytes(content)
+
+
+def open_image(content: bytes) -> Image.Image:
+    """
+    Return the given image content rotated as its EXIF data says, in RGB over
+    a white background if it has transparency.
+    """
+
+    try:
+        image: Image.Image = ImageOps.exif_transpose(Image.open(BytesIO(content)))
+        if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+            image = image.convert("RGBA")
+            background: Image.Image = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            return background
+        return image.convert("RGB")
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise ImageError(f"Invalid image: {exc}")
+
+
+def get_facebook_image(image: Image.Image) -> Image.Image:
+    """
+    Return the given image shrunk to fit the size Facebook shows at most.
+    """
+
+    facebook_image: Image.Image = image.copy()
+    facebook_image.thumbnail(
+        (FACEBOOK_MAX_SIZE, FACEBOOK_MAX_SIZE), Image.Resampling.LANCZOS
+    )
+    return facebook_image
+
+
+def get_instagram_image(image: Image.Image) -> Image.Image:
+    """
+    Return the given image cropped around its center to the closest aspect
+    ratio Instagram accepts, and resized to a width it keeps as is.
+    """
+
+    width, height = image.size
+    ratio: float = min(max(width / height, INSTAGRAM_MIN_RATIO), INSTAGRAM_MAX_RATIO)
+    crop_width: int = min(width, round(height * ratio))
+    crop_height: int = min(height, round(width / ratio))
+    left: int = (width - crop_width) // 2
+    top: int = (height - crop_height) // 2
+    instagram_image: Image.Image = image.crop(
+        (left, top, left + crop_width, top + crop_height)
+    )
+
+    target_width: int = min(max(crop_width, INSTAGRAM_MIN_WIDTH), INSTAGRAM_MAX_WIDTH)
+    if target_width != crop_width:
+        instagram_image = instagram_image.resize(
+            (target_width, round(crop_height * target_width / crop_width)),
+            Image.Resampling.LANCZOS,
+        )
+    return instagram_image
+
+
+def save_image(name: str, image: Image.Image) -> str:
+    """
+    Store the given image as a JPEG file with the given name, unless it's
+    already stored. Return the stored file name.
+    """
+
+    if default_storage.exists(name):
+        return name
+    content = BytesIO()
+    image.save(
+        content,
+        "JPEG",
+        quality=settings.IMAGE_JPEG_QUALITY,
+        optimize=True,
+        progressive=True,
+    )
+    return default_storage.save(name, ContentFile(content.getvalue()))
+
+
+def get_image_asset(url: str) -> ImageAsset:
+    """
+    Return the :model:`scraper.ImageAsset` instance of the given image URL,
+    downloading and resizing the image only if no instance has it already.
+    """
+
+    image_asset: ImageAsset | None = ImageAsset.objects.filter(source_url=url).first()
+    if image_asset is not None:
+        return image_asset
+
+    content: bytes = download_image(url)
+    checksum: str = hashlib.sha256(content).hexdigest()
+    image_asset = ImageAsset.objects.filter(checksum=checksum).first()
+    if image_asset is not None:
+        return image_asset
+
+    image: Image.Image = open_image(content)
+    prefix: str = f"images/{checksum[:2]}/{checksum}"
+    image_asset = ImageAsset(checksum=checksum, source_url=url)
+    image_asset.facebook_image.name = save_image(
+        f"{prefix}_facebook.jpg", get_facebook_image(image)
+    )
+    image_asset.instagram_image.name = save_image(
+        f"{prefix}_instagram.jpg", get_instagram_image(image)
+    )
+    try:
+        image_asset.save()
+    except IntegrityError:
+        # Stored meanwhile by another worker.
+        return ImageAsset.objects.get(checksum=checksum)
+    return image_asset
+
+
+def prepare_article_images(articles_list: list[Article]) -> int:
+    """
+    Link the given :model:`scraper.Article` instances to the
+    :model:`scraper.ImageAsset` instance of their image. Articles whose image
+    fails are left to be published with their image URL, and the image isn't
+    tried again until the configured time has passed.
+    Return the number of linked articles.
+    """
+
+    article_ids: dict[str, list[int]] = defaultdict(list)
+    for article in articles_list:
+        article_ids[article.image].append(article.id)
+
+    total_linked: int = 0
+    for url, article_ids_list in article_ids.items():
+        cache_key: str = FAILED_IMAGE_CACHE_KEY.format(
+            hashlib.sha256(url.encode()).hexdigest()
+        )
+        if cache.get(cache_key):
+            continue
+        try:
+            image_asset: ImageAsset = get_image_asset(url)
+        except (ImageError, RequestException) as exc:
+            logger.warning(f"Could not prepare image {url}: {exc}")
+            cache.set(cache_key, True, settings.IMAGE_FAILURE_TIMEOUT)
+            continue
+        total_linked += Article.objects.filter(id__in=article_ids_list).update(
+            image_asset=image_asset
+        )
+    return total_linked
+
+
+def get_image_url(article: Article, field_name: str) -> str:
+    """
+    Return the public URL of the given image field of the
+    :model:`scraper.ImageAsset` instance of the given
+    :model:`scraper.Article`, or its image URL if it has none.
+    """
+
+    if article.image_asset is None or not settings.SITE_URL:
+        return article.image
+    return settings.SITE_URL.rstrip("/") + getattr(article.image_asset, field_name).url
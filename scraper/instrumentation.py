@@ -0,0 +1,50 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+_recordings: list[dict[str, float]] = []
+_recordings_lock = threading.Lock()
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """
+    Add the duration of a scraping phase to every active recording.
+    """
+
+    with _recordings_lock:
+        for timings in _recordings:
+            timings[name] += seconds
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Time the wrapped block as the given scraping phase, e.g. "listing_fetch",
+    "detail_fetch", "parse" or "db_write".
+    """
+
+    started: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+@contextmanager
+def recording() -> Iterator[dict[str, float]]:
+    """
+    Collect the seconds spent on each phase, from any thread, while the wrapped
+    block runs. Phases running concurrently add up, so totals may exceed the
+    wall time.
+    """
+
+    timings: dict[str, float] = defaultdict(float)
+    with _recordings_lock:
+        _recordings.append(timings)
+    try:
+        yield timings
+    finally:
+        with _recordings_lock:
+            _recordings[:] = [other for other in _recordings if other is not timings]
@@ -0,0 +1,95 @@
+from datetime import date
+
+from celery import group
+from django.core.management.base import BaseCommand, CommandError
+
+from scraper.backfill import get_checkpoints
+from scraper.models import BackfillCheckpoint, NewsPage
+from scraper.tasks import backfill_articles_task
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the missing articles posted from --since to --until, walking the "
+        "paginated listing of every news page with one task per range of pages. "
+        "Running it again with the same --since resumes where it stopped, keeping "
+        "its --until and page ranges unless another --until is given."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--since",
+            type=date.fromisoformat,
+            required=True,
+            help="Date of the oldest articles to create, as YYYY-MM-DD.",
+        )
+        parser.add_argument(
+            "--until",
+            type=date.fromisoformat,
+            help="Date of the newest articles to create, as YYYY-MM-DD. That of the "
+            "unfinished backfill from --since by default, today otherwise.",
+        )
+        parser.add_argument(
+            "--news-page",
+            type=int,
+            help="ID of the only news page to backfill, every one by default.",
+        )
+        parser.add_argument(
+            "--pages-per-task",
+            type=int,
+            default=5,
+            help="Number of listing pages walked by each task.",
+        )
+        parser.add_argument(
+            "--max-pages",
+            type=int,
+            default=50,
+            help="Number of listing pages of a news page walked at most.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        since: date = options["since"]
+        until: date | None = options["until"]
+        if until is not None and since > until:
+            raise CommandError("--since must not be after --until.")
+        if options["pages_per_task"] < 1 or options["max_pages"] < 1:
+            raise CommandError("--pages-per-task and --max-pages must be positive.")
+
+        news_pages = NewsPage.objects.all()
+        if options["news_page"] is not None:
+            news_pages = news_pages.filter(id=options["news_page"])
+        news_pages_list: list[NewsPage] = list(news_pages)
+        if not news_pages_list:
+            raise CommandError("No news pages to backfill.")
+
+        checkpoints_list: list[BackfillCheckpoint] = []
+        for news_page in news_pages_list:
+            news_page_checkpoints_list: list[BackfillCheckpoint] = get_checkpoints(
+                news_page,
+                since,
+                until,
+                options["pages_per_task"],
+                options["max_pages"],
+            )
+            page_until: date = news_page_checkpoints_list[0].until
+            news_page_checkpoints_list = [
+                checkpoint
+                for checkpoint in news_page_checkpoints_list
+                if checkpoint.finished_at is None
+            ]
+            self.stdout.write(
+                f"{news_page}: {len(news_page_checkpoints_list)} page ranges left "
+                f"until {page_until}."
+            )
+            checkpoints_list += news_page_checkpoints_list
+
+        if checkpoints_list:
+            group(
+                backfill_articles_task.s(checkpoint.id)
+                for checkpoint in checkpoints_list
+            ).apply_async()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfilling {len(checkpoints_list)} page ranges from {since}."
+            )
+        )
@@ -0,0 +1,123 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from scraper import parsers
+from scraper.benchmarks import legacy_parsers
+from scraper.benchmarks.memory import measure_peak_rss
+from scraper.benchmarks.synthetic import detail_html, listing_html
+from scraper.models import NewsPage
+
+BASE_URL: str = "https://noticias.example.com/"
+PARSERS: dict = {"bs4": legacy_parsers, "lxml": parsers}
+
+
+def get_news_page(news_page_id: int) -> NewsPage:
+    return NewsPage(id=news_page_id, name=f"Benchmark {news_page_id}", url=BASE_URL)
+
+
+def parse_documents(
+    parser_name: str,
+    news_page_id: int,
+    listing: str,
+    details_list: list[tuple[str, str]],
+) -> list:
+    """
+    Parse the listing, and its detail pages if any, with the parsers module
+    of the given name.
+    """
+
+    module = PARSERS[parser_name]
+    news_page: NewsPage = get_news_page(news_page_id)
+    articles_list: list = module.parse_listing(news_page, listing)
+    if details_list:
+        articles_list = [
+            module.parse_detail(news_page, url, document)
+            for url, document in details_list
+        ]
+    return articles_list
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare parse time and peak resident memory of the lxml/XPath parsers "
+        "against the previous BeautifulSoup implementation."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--news-page",
+            type=int,
+            choices=(1, 2, 3),
+            help="Benchmark a single news page layout.",
+        )
+        parser.add_argument(
+            "--articles",
+            type=int,
+            default=20,
+            help="Number of articles per listing page.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Number of timed runs per parser.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        news_page_ids_list: list[int] = (
+            [options["news_page"]] if options["news_page"] else [1, 2, 3]
+        )
+        for news_page_id in news_page_ids_list:
+            news_page: NewsPage = get_news_page(news_page_id)
+            listing: str = listing_html(
+                news_page_id, options["articles"], date.today(), BASE_URL
+            )
+            details_list: list[tuple[str, str]] = []
+            if news_page_id == 2:
+                details_list = [
+                    (
+                        article.url,
+                        detail_html(article.id_number, date.today(), BASE_URL),
+                    )
+                    for article in parsers.parse_listing(news_page, listing)
+                ]
+
+            results: dict = {}
+            for name in PARSERS:
+                results[name] = self.measure(
+                    options["repeat"], name, news_page_id, listing, details_list
+                )
+
+            self.stdout.write(
+                f"News page {news_page_id} ({options['articles']} articles)"
+            )
+            for name, (seconds, peak, articles) in results.items():
+                self.stdout.write(
+                    f"  {name:<5} {seconds * 1000:9.2f} ms/run "
+                    f"{peak / 1024:10.1f} KiB peak RSS"
+                )
+            bs4_seconds, bs4_peak, bs4_articles = results["bs4"]
+            lxml_seconds, lxml_peak, lxml_articles = results["lxml"]
+            self.stdout.write(
+                f"  speedup x{bs4_seconds / lxml_seconds:.1f}, "
+                f"peak RSS x{bs4_peak / max(lxml_peak, 1):.1f} lower"
+            )
+            if bs4_articles != lxml_articles:
+                self.stderr.write(self.style.WARNING("  Parsed articles differ."))
+
+    @staticmethod
+    def measure(repeat: int, *args) -> tuple[float, int, list]:
+        """
+        Parse the documents with the given arguments of parse_documents and
+        return the mean seconds per run, the peak resident memory growth in
+        bytes of a single run in its own process and the parsed articles.
+        """
+
+        peak: int = measure_peak_rss(f"{__name__}.parse_documents", *args)
+        articles_list: list = parse_documents(*args)
+        started: float = time.perf_counter()
+        for _ in range(repeat):
+            parse_documents(*args)
+        return (time.perf_counter() - started) / repeat, peak, articles_list
@@ -0,0 +1,258 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import date
+from typing import Callable
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from scraper.benchmarks.fixtures import (
+    get_listing_path,
+    get_versions,
+    load_manifest,
+    recorded_site,
+    route_news_pages,
+    synthetic_site,
+)
+from scraper.benchmarks.memory import measure_peak_rss
+from scraper.benchmarks.server import get_pages_handler, serve
+from scraper.custom_pickle import fetch_new_articles
+from scraper.instrumentation import recording
+from scraper.models import NewsPage
+
+PHASES: tuple = ("listing_fetch", "detail_fetch", "parse", "db_write")
+
+
+def save_news_pages(news_pages_list: list[tuple[int, str, str]]) -> list[int]:
+    """
+    Point the news pages of the given IDs to the given names and URLs,
+    forgetting their last listing so none is skipped as unchanged. Return
+    their IDs.
+    """
+
+    for news_page_id, name, url in news_pages_list:
+        NewsPage.objects.update_or_create(
+            id=news_page_id,
+            defaults={
+                "name": name,
+                "url": url,
+                "etag": "",
+                "last_modified": "",
+                "content_hash": "",
+            },
+        )
+    return [news_page_id for news_page_id, name, url in news_pages_list]
+
+
+def scrape_news_pages(
+    news_pages_list: list[tuple[int, str, str]], target_date: date
+) -> None:
+    """
+    Scrape the news pages of the given IDs, names and URLs once, rolling back
+    every database change.
+    """
+
+    with transaction.atomic():
+        fetch_new_articles(target_date, save_news_pages(news_pages_list))
+        transaction.set_rollback(True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run fetch_new_articles against a local stand-in for the news pages, "
+        "serving recorded fixtures and synthetic pages scaled to more articles, "
+        "and report phase timings, throughput and peak resident memory."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--fixtures",
+            help="Fixture version to serve, the latest one by default.",
+        )
+        parser.add_argument(
+            "--scales",
+            default="1,10,100",
+            help="Comma separated article multipliers. 1 serves the recorded "
+            "fixtures, the rest synthetic pages with as many times more articles.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of timed runs per scale, reporting the median.",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Seconds the stand-in waits before answering each request.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the machine readable results to this JSON file.",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Compare the results against a JSON file from a previous run.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        versions_list: list[str] = get_versions()
+        version: str | None = options["fixtures"] or (
+            versions_list[-1] if versions_list else None
+        )
+        if version not in versions_list:
+            raise CommandError(f"Unknown fixture version {version}.")
+        manifest: dict = load_manifest(version)
+        target_date: date = date.fromisoformat(manifest["recorded_on"])
+        scales_list: list[int] = [int(scale) for scale in options["scales"].split(",")]
+
+        results_list: list[dict] = []
+        for scale in scales_list:
+            resolvers: dict[int, Callable] = {}
+            handler = get_pages_handler(route_news_pages(resolvers), options["latency"])
+            with serve(handler) as server_url:
+                news_pages_list: list[NewsPage] = []
+                for news_page_id, news_page in manifest["news_pages"].items():
+                    base_url: str = f"{server_url}/news_page_{news_page_id}"
+                    if scale == 1:
+                        resolvers[int(news_page_id)] = recorded_site(
+                            version, int(news_page_id), base_url
+                        )
+                        url: str = base_url + get_listing_path(news_page["url"])
+                    else:
+                        resolvers[int(news_page_id)] = synthetic_site(
+                            int(news_page_id),
+                            news_page["articles"] * scale,
+                            news_page["today_articles"] * scale,
+                            target_date,
+                            base_url,
+                        )
+                        url = f"{base_url}/"
+                    news_pages_list.append(
+                        NewsPage(id=int(news_page_id), name=news_page["name"], url=url)
+                    )
+                result: dict = self.run_scale(
+                    news_pages_list, target_date, options["repeat"]
+                )
+            result["scale"] = scale
+            result["listed_articles"] = sum(
+                news_page["articles"] * scale
+                for news_page in manifest["news_pages"].values()
+            )
+            results_list.append(result)
+            self.write_result(result)
+
+        report: dict = {
+            "fixtures": version,
+            "commit": self.get_commit(),
+            "created": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "settings": {
+                "SCRAPER_MAX_WORKERS": settings.SCRAPER_MAX_WORKERS,
+                "SCRAPER_DETAIL_WORKERS": settings.SCRAPER_DETAIL_WORKERS,
+                "SCRAPER_MAX_REQUESTS_PER_HOST": settings.SCRAPER_MAX_REQUESTS_PER_HOST,
+                "latency": options["latency"],
+            },
+            "results": results_list,
+        }
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as file:
+                self.compare(json.load(file), report)
+
+    @staticmethod
+    def run_scale(
+        news_pages_list: list[NewsPage], target_date: date, repeat: int
+    ) -> dict:
+        """
+        Scrape the given news pages repeat times, plus once in its own process
+        measuring the peak resident memory, rolling back every database
+        change. Return the median timings.
+        """
+
+        news_pages_tuples_list: list[tuple[int, str, str]] = [
+            (news_page.id, news_page.name, news_page.url)
+            for news_page in news_pages_list
+        ]
+        runs_list: list[dict] = []
+        with transaction.atomic():
+            news_page_ids_list: list[int] = save_news_pages(news_pages_tuples_list)
+            for _ in range(repeat):
+                savepoint = transaction.savepoint()
+                with recording() as timings:
+                    started: float = time.perf_counter()
+                    created: int = fetch_new_articles(target_date, news_page_ids_list)
+                    wall: float = time.perf_counter() - started
+                runs_list.append({"wall": wall, "created": created, **timings})
+                transaction.savepoint_rollback(savepoint)
+            transaction.set_rollback(True)
+        peak_rss: int = measure_peak_rss(
+            f"{__name__}.scrape_news_pages", news_pages_tuples_list, target_date
+        )
+
+        wall = statistics.median(run["wall"] for run in runs_list)
+        created = runs_list[0]["created"]
+        return {
+            "created_articles": created,
+            "wall_seconds": wall,
+            "phase_seconds": {
+                name: statistics.median(run.get(name, 0.0) for run in runs_list)
+                for name in PHASES
+            },
+            "articles_per_second": created / wall if wall else 0.0,
+            "peak_rss_bytes": peak_rss,
+        }
+
+    def write_result(self, result: dict) -> None:
+        phases: str = ", ".join(
+            f"{name} {seconds * 1000:.1f} ms"
+            for name, seconds in result["phase_seconds"].items()
+        )
+        self.stdout.write(
+            f"x{result['scale']}: {result['created_articles']} articles in "
+            f"{result['wall_seconds'] * 1000:.1f} ms "
+            f"({result['articles_per_second']:.1f} articles/s, "
+            f"{result['peak_rss_bytes'] / 1024:.0f} KiB peak RSS)\n  {phases}"
+        )
+
+    def compare(self, baseline: dict, report: dict) -> None:
+        """
+        Write the wall time change of every scale against the baseline report.
+        """
+
+        baseline_results: dict = {
+            result["scale"]: result for result in baseline["results"]
+        }
+        self.stdout.write(f"Compared to {baseline.get('commit') or 'baseline'}:")
+        for result in report["results"]:
+            previous: dict | None = baseline_results.get(result["scale"])
+            if previous is None:
+                continue
+            change: float = result["wall_seconds"] / previous["wall_seconds"] - 1
+            style = self.style.ERROR if change > 0.1 else self.style.SUCCESS
+            self.stdout.write(style(f"  x{result['scale']}: {change:+.1%} wall time"))
+
+    @staticmethod
+    def get_commit() -> str | None:
+        """
+        Return the current git commit, if any.
+        """
+
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,176 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from scraper.models import Article, FingerprintBand, NewsPage
+
+QUERY_PLAN_PREFIX: str = "queryplan"
+
+# Source of the row numbers 1 to %s, and the expression of the post date of
+# row n, per database vendor.
+SEQUENCES: dict[str, str] = {
+    "sqlite": (
+        "(WITH RECURSIVE seq(n) AS "
+        "(SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %s) SELECT n FROM seq)"
+    ),
+    "postgresql": "(SELECT generate_series(1, %s) AS n)",
+}
+POST_DATES: dict[str, str] = {
+    "sqlite": "date(%s, '-' || (n / %s) || ' days')",
+    "postgresql": "CAST(%s AS date) - CAST(n / %s AS integer)",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the article table with generated rows inside a rolled-back "
+        "transaction and check the hot article queries use their indexes."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=2_000_000,
+            help="Number of generated articles.",
+        )
+        parser.add_argument(
+            "--per-day",
+            type=int,
+            default=300,
+            help="Generated articles per day, the newest two days unposted.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if connection.vendor not in SEQUENCES:
+            raise CommandError(f"Unsupported database vendor {connection.vendor}.")
+
+        failed_list: list[str] = []
+        with transaction.atomic():
+            started: float = time.perf_counter()
+            news_pages_list: list[NewsPage] = self.create_articles(
+                options["rows"], options["per_day"]
+            )
+            self.stdout.write(
+                f"{options['rows']} articles generated in "
+                f"{time.perf_counter() - started:.1f} s."
+            )
+
+            today: date = timezone.now().date()
+            for name, queryset, indexes in self.get_queries(today, news_pages_list):
+                plan: str = queryset.explain()
+                is_indexed: bool = any(index in plan for index in indexes)
+                style = self.style.SUCCESS if is_indexed else self.style.ERROR
+                self.stdout.write(style(f"{'OK' if is_indexed else 'FAIL'} {name}"))
+                self.stdout.write(f"  {plan}".replace("\n", "\n  "))
+                if not is_indexed:
+                    failed_list.append(name)
+            transaction.set_rollback(True)
+
+        if failed_list:
+            raise CommandError(
+                f"Queries not using their indexes: {', '.join(failed_list)}."
+            )
+
+    @staticmethod
+    def create_articles(rows: int, per_day: int) -> list[NewsPage]:
+        """
+        Insert the given number of articles, newest first, spread over three
+        news pages. Return the news pages.
+        """
+
+        news_pages_list: list[NewsPage] = [
+            NewsPage.objects.create(
+                name=f"{QUERY_PLAN_PREFIX} {index}",
+                url=f"https://{QUERY_PLAN_PREFIX}.example/{index}/",
+            )
+            for index in range(3)
+        ]
+        news_page_ids: list[int] = [news_page.id for news_page in news_pages_list]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Article._meta.db_table}
+                    (id_number, news_page_id, url, title, post_date, image, body,
+                     is_facebook, is_instagram)
+                SELECT
+                    '{QUERY_PLAN_PREFIX}-' || n,
+                    CASE n %% 3 WHEN 0 THEN %s WHEN 1 THEN %s ELSE %s END,
+                    'https://{QUERY_PLAN_PREFIX}.example/' || n || '/',
+                    'Article ' || n,
+                    {POST_DATES[connection.vendor]},
+                    'https://{QUERY_PLAN_PREFIX}.example/' || n || '.jpg',
+                    'Body',
+                    n > %s,
+                    n > %s
+                FROM {SEQUENCES[connection.vendor]} AS seq
+                """,
+                [
+                    *news_page_ids,
+                    timezone.now().date().isoformat(),
+                    per_day,
+                    per_day * 2,
+                    per_day * 2,
+                    rows,
+                ],
+            )
+            cursor.execute(f"ANALYZE {Article._meta.db_table}")
+        return news_pages_list
+
+    @staticmethod
+    def get_queries(
+        today: date, news_pages_list: list[NewsPage]
+    ) -> list[tuple[str, QuerySet, tuple]]:
+        """
+        Return the name, queryset and accepted index names of every hot
+        article query.
+        """
+
+        return [
+            (
+                "today's articles",
+                Article.objects.filter(post_date=today).values_list("id", flat=True),
+                ("article_post_date_idx", "article_original_date_idx"),
+            ),
+            (
+                "admin list",
+                Article.objects.all()[:100],
+                ("article_post_date_idx",),
+            ),
+            (
+                "admin list by date",
+                Article.objects.filter(
+                    post_date__range=(today - timedelta(days=7), today)
+                )[:100],
+                ("article_post_date_idx", "article_original_date_idx"),
+            ),
+            (
+                "admin list not in Facebook",
+                Article.objects.filter(is_facebook=False)[:100],
+                ("article_post_date_idx",),
+            ),
+            (
+                "articles to post",
+                Article.objects.filter(
+                    post_date=today, duplicate_of__isnull=True
+                ).values_list("id", flat=True),
+                ("article_original_date_idx",),
+            ),
+            (
+                "admin list by news page",
+                Article.objects.filter(news_page=news_pages_list[0])[:100],
+                ("article_news_page_date_idx",),
+            ),
+            (
+                "duplicate candidates",
+                FingerprintBand.objects.filter(
+                    value__in=range(16),
+                    article__post_date__range=(today - timedelta(days=2), today),
+                ).values_list("article_id", "article__fingerprint"),
+                ("fingerprintband_value",),
+            ),
+        ]
@@ -0,0 +1,301 @@
+import json
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from ezalor.celery import app
+from scraper.benchmarks.graph_api import EXPIRED_TOKEN, FakeGraphAPI
+from scraper.benchmarks.server import serve
+from scraper.models import (
+    Article,
+    FacebookPage,
+    FacebookPost,
+    InstagramPost,
+    InstagramProfile,
+    NewsPage,
+)
+from scraper.tasks import auto_create_posts_task
+
+LOAD_TEST_PREFIX: str = "loadtest"
+
+
+class Command(BaseCommand):
+    help = (
+        "Push articles times Facebook pages and Instagram profiles through "
+        "auto_create_posts_task against a local fake Graph API and report "
+        "posts per second and latency percentiles."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--articles", type=int, default=20)
+        parser.add_argument("--pages", type=int, default=5)
+        parser.add_argument("--profiles", type=int, default=2)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.05,
+            help="Seconds the fake Graph API waits before answering.",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Fraction of requests answered with a transient error.",
+        )
+        parser.add_argument(
+            "--calls-per-minute",
+            type=int,
+            default=0,
+            help="Calls per target and minute before answering rate limit errors.",
+        )
+        parser.add_argument(
+            "--container-delay",
+            type=float,
+            default=0.0,
+            help="Seconds an Instagram container takes to finish processing.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds between Instagram container status checks when running "
+            "eagerly. Workers use INSTAGRAM_CONTAINER_POLL_INTERVAL.",
+        )
+        parser.add_argument(
+            "--expired-tokens",
+            type=int,
+            default=0,
+            help="Number of Facebook pages and Instagram profiles with an expired "
+            "token.",
+        )
+        parser.add_argument("--seed", type=int, help="Seed of the injected errors.")
+        parser.add_argument(
+            "--workers",
+            action="store_true",
+            help="Dispatch to running Celery workers instead of running the tasks "
+            "eagerly in this process. Workers need GRAPH_API_URL pointing to the "
+            "fake Graph API, see --host and --port.",
+        )
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=0)
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=300,
+            help="Seconds to wait for the workers to publish every post.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run even if the database already holds publishing targets.",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options) -> None:
+        if not options["force"] and (
+            FacebookPage.objects.exists() or InstagramProfile.objects.exists()
+        ):
+            raise CommandError(
+                "The database already holds Facebook pages or Instagram profiles, "
+                "which would be published to as well. Run against a development "
+                "database or pass --force."
+            )
+
+        graph_api = FakeGraphAPI(
+            latency=options["latency"],
+            error_rate=options["error_rate"],
+            calls_per_minute=options["calls_per_minute"],
+            container_delay=options["container_delay"],
+            seed=options["seed"],
+        )
+        with serve(graph_api.handler_class(), options["host"], options["port"]) as url:
+            if options["workers"]:
+                self.stdout.write(f"Fake Graph API listening on {url}")
+                latencies_list, elapsed = self.run_workers(options)
+            else:
+                with override_settings(
+                    GRAPH_API_URL=url,
+                    INSTAGRAM_CONTAINER_POLL_INTERVAL=options["poll_interval"],
+                ):
+                    latencies_list, elapsed = self.run_eager(options)
+
+        pairs: int = options["articles"] * (options["pages"] + options["profiles"])
+        results: dict = {
+            "pairs": pairs,
+            "posts": len(latencies_list),
+            "elapsed_seconds": elapsed,
+            "posts_per_second": len(latencies_list) / elapsed if elapsed else 0.0,
+            "latency_seconds": self.get_percentiles(latencies_list),
+            "graph_api": dict(graph_api.counters),
+        }
+        self.stdout.write(
+            f"{results['posts']}/{pairs} posts in {elapsed:.2f} s "
+            f"({results['posts_per_second']:.1f} posts/s)"
+        )
+        self.stdout.write(
+            "Latency "
+            + ", ".join(
+                f"{name} {seconds:.3f} s"
+                for name, seconds in results["latency_seconds"].items()
+            )
+        )
+        self.stdout.write(
+            "Graph API "
+            + ", ".join(f"{name} {count}" for name, count in graph_api.counters.items())
+        )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=2)
+
+    def run_eager(self, options: dict) -> tuple[list[float], float]:
+        """
+        Run the publishing tasks in this process, rolling back every database
+        change. Return the post latencies and the elapsed seconds.
+        """
+
+        with self.eager_tasks(), transaction.atomic():
+            self.create_targets(options)
+            started: datetime = timezone.now()
+            auto_create_posts_task.delay()
+            elapsed: float = (timezone.now() - started).total_seconds()
+            latencies_list: list[float] = self.get_latencies(started)
+            transaction.set_rollback(True)
+        return latencies_list, elapsed
+
+    def run_workers(self, options: dict) -> tuple[list[float], float]:
+        """
+        Dispatch the publishing tasks to the running Celery workers and wait for
+        them to publish every post, deleting the load test data afterwards.
+        Return the post latencies and the elapsed seconds.
+        """
+
+        pairs: int = options["articles"] * (options["pages"] + options["profiles"])
+        self.create_targets(options)
+        try:
+            started: datetime = timezone.now()
+            auto_create_posts_task.delay()
+            deadline: float = time.monotonic() + options["timeout"]
+            while time.monotonic() < deadline:
+                if self.get_posts_count() >= pairs:
+                    break
+                time.sleep(0.5)
+            latencies_list: list[float] = self.get_latencies(started)
+            elapsed: float = max(latencies_list, default=0.0)
+        finally:
+            self.delete_targets()
+        return latencies_list, elapsed
+
+    @staticmethod
+    @contextmanager
+    def eager_tasks() -> Iterator[None]:
+        """
+        Run Celery tasks eagerly, recording failures instead of raising them.
+        """
+
+        previous: tuple = (app.conf.task_always_eager, app.conf.task_eager_propagates)
+        app.conf.task_always_eager = True
+        app.conf.task_eager_propagates = False
+        try:
+            yield
+        finally:
+            app.conf.task_always_eager, app.conf.task_eager_propagates = previous
+
+    @staticmethod
+    def create_targets(options: dict) -> None:
+        news_page = NewsPage.objects.create(
+            name=f"{LOAD_TEST_PREFIX} news page", url="https://loadtest.example/"
+        )
+        Article.objects.bulk_create(
+            Article(
+                id_number=f"{LOAD_TEST_PREFIX}-{index}",
+                news_page=news_page,
+                url=f"https://loadtest.example/{index}/",
+                title=f"Load test article {index}",
+                post_date=timezone.now().date(),
+                image=f"https://loadtest.example/{index}.jpg",
+                body="Load test article body.",
+            )
+            for index in range(options["articles"])
+        )
+        FacebookPage.objects.bulk_create(
+            FacebookPage(
+                name=f"{LOAD_TEST_PREFIX} page {index}",
+                page_id=f"{LOAD_TEST_PREFIX}-page-{index}",
+                page_token=(
+                    EXPIRED_TOKEN if index < options["expired_tokens"] else "token"
+                ),
+            )
+            for index in range(options["pages"])
+        )
+        InstagramProfile.objects.bulk_create(
+            InstagramProfile(
+                name=f"{LOAD_TEST_PREFIX} profile {index}",
+                user_id=f"{LOAD_TEST_PREFIX}-profile-{index}",
+                user_token=(
+                    EXPIRED_TOKEN if index < options["expired_tokens"] else "token"
+                ),
+            )
+            for index in range(options["profiles"])
+        )
+
+    @staticmethod
+    def delete_targets() -> None:
+        articles = Article.objects.filter(id_number__startswith=LOAD_TEST_PREFIX)
+        FacebookPost.objects.filter(article__in=articles).delete()
+        InstagramPost.objects.filter(article__in=articles).delete()
+        articles.delete()
+        NewsPage.objects.filter(name__startswith=LOAD_TEST_PREFIX).delete()
+        FacebookPage.objects.filter(page_id__startswith=LOAD_TEST_PREFIX).delete()
+        InstagramProfile.objects.filter(user_id__startswith=LOAD_TEST_PREFIX).delete()
+
+    @staticmethod
+    def get_posts_count() -> int:
+        return (
+            FacebookPost.objects.filter(
+                article__id_number__startswith=LOAD_TEST_PREFIX, post_id__isnull=False
+            ).count()
+            + InstagramPost.objects.filter(
+                article__id_number__startswith=LOAD_TEST_PREFIX, post_id__isnull=False
+            ).count()
+        )
+
+    @staticmethod
+    def get_latencies(started: datetime) -> list[float]:
+        """
+        Return the seconds from the dispatch to every published load test post.
+        """
+
+        post_dates_list: list[datetime] = [
+            *FacebookPost.objects.filter(
+                article__id_number__startswith=LOAD_TEST_PREFIX, post_id__isnull=False
+            ).values_list("post_date", flat=True),
+            *InstagramPost.objects.filter(
+                article__id_number__startswith=LOAD_TEST_PREFIX, post_id__isnull=False
+            ).values_list("post_date", flat=True),
+        ]
+        return sorted(
+            (post_date - started).total_seconds() for post_date in post_dates_list
+        )
+
+    @staticmethod
+    def get_percentiles(latencies_list: list[float]) -> dict[str, float]:
+        if not latencies_list:
+            return {}
+        quantiles: list[float] = statistics.quantiles(
+            latencies_list * 2 if len(latencies_list) == 1 else latencies_list,
+            n=100,
+            method="inclusive",
+        )
+        return {
+            "p50": quantiles[49],
+            "p90": quantiles[89],
+            "p99": quantiles[98],
+            "max": latencies_list[-1],
+        }
@@ -0,0 +1,272 @@
+import cProfile
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import date
+from io import StringIO
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import reset_queries, transaction
+from django.test.utils import override_settings
+
+from scraper.benchmarks.fixtures import (
+    get_listing_path,
+    get_versions,
+    load_manifest,
+    recorded_site,
+    route_news_pages,
+)
+from scraper.benchmarks.server import get_pages_handler, serve
+from scraper.custom_pickle import fetch_new_articles
+from scraper.instrumentation import recording
+from scraper.models import NewsPage
+
+PHASES: tuple = ("listing_fetch", "detail_fetch", "parse", "db_write")
+SORT_KEYS: tuple = ("cumulative", "tottime", "ncalls")
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile fetch_new_articles against the live news pages or recorded "
+        "fixtures, reporting the hottest functions, the time spent on each "
+        "phase and the allocation sites still holding memory after scraping. "
+        "Database changes are rolled back."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--news-page",
+            type=int,
+            help="ID of the only news page to scrape, every one by default.",
+        )
+        parser.add_argument(
+            "--fixtures",
+            nargs="?",
+            const="",
+            help="Scrape the recorded pages of this fixture version, the latest "
+            "one if no version is given, instead of the live news pages.",
+        )
+        parser.add_argument(
+            "--date",
+            type=date.fromisoformat,
+            help="Date of the articles to scrape, as YYYY-MM-DD. Today for the "
+            "live news pages and the recording date for fixtures by default.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=SORT_KEYS,
+            default="cumulative",
+            help="Order of the hot function table.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=30,
+            help="Number of functions and retained allocation sites to report.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the raw cProfile stats to this file, e.g. for snakeviz.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        with ExitStack() as stack:
+            if options["fixtures"] is None:
+                news_pages_list: list[NewsPage] = self.get_live_news_pages(
+                    options["news_page"]
+                )
+                target_date: date = options["date"] or date.today()
+            else:
+                news_pages_list, recorded_on = self.get_fixture_news_pages(
+                    stack, options["fixtures"], options["news_page"]
+                )
+                target_date = options["date"] or recorded_on
+
+            profile_stats, timings, wall = self.run_profiled(
+                news_pages_list, target_date
+            )
+            peak_memory, statistics_list = self.run_traced(news_pages_list, target_date)
+
+        self.write_title("Hot functions")
+        profile_stats.stream = StringIO()
+        profile_stats.sort_stats(options["sort"]).print_stats(options["limit"])
+        self.stdout.write(profile_stats.stream.getvalue())
+        if options["output"]:
+            profile_stats.dump_stats(options["output"])
+
+        self.write_title("Phases")
+        self.stdout.write(f"  {'wall':<14}{wall * 1000:>10.1f} ms")
+        for name in PHASES:
+            self.stdout.write(f"  {name:<14}{timings.get(name, 0.0) * 1000:>10.1f} ms")
+        self.stdout.write(
+            "  Phases running in several threads at once add up, so they may "
+            "exceed the wall time."
+        )
+
+        self.write_title("Retained allocations")
+        self.stdout.write(
+            f"  Peak traced memory: {peak_memory / 1024:.0f} KiB, Python "
+            "allocations only."
+        )
+        self.stdout.write(
+            "  Memory still held after scraping compared to before, by "
+            "allocation site. Temporary allocations freed during the scrape "
+            "are not listed."
+        )
+        for statistic in statistics_list[: options["limit"]]:
+            self.stdout.write(f"  {statistic}")
+
+    def write_title(self, title: str) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n{title}"))
+
+    @staticmethod
+    def get_live_news_pages(news_page_id: int | None) -> list[NewsPage]:
+        news_pages = NewsPage.objects.all()
+        if news_page_id is not None:
+            news_pages = news_pages.filter(id=news_page_id)
+        news_pages_list: list[NewsPage] = list(news_pages)
+        if not news_pages_list:
+            raise CommandError("No news pages to scrape.")
+        return news_pages_list
+
+    @staticmethod
+    def get_fixture_news_pages(
+        stack: ExitStack, version: str, news_page_id: int | None
+    ) -> tuple[list[NewsPage], date]:
+        """
+        Serve the recorded pages of the given fixture version, the latest one
+        if empty, from a local server running until the given stack closes.
+        Return news pages pointing to it and the recording date.
+        """
+
+        versions_list: list[str] = get_versions()
+        version = version or (versions_list[-1] if versions_list else "")
+        if version not in versions_list:
+            raise CommandError(f"Unknown fixture version {version}.")
+        manifest: dict = load_manifest(version)
+        if news_page_id is not None and str(news_page_id) not in manifest["news_pages"]:
+            raise CommandError(
+                f"Fixture version {version} has no news page {news_page_id}."
+            )
+
+        resolvers: dict[int, Callable] = {}
+        server_url: str = stack.enter_context(
+            serve(get_pages_handler(route_news_pages(resolvers)))
+        )
+        news_pages_list: list[NewsPage] = []
+        for fixture_id, news_page in manifest["news_pages"].items():
+            if news_page_id is not None and int(fixture_id) != news_page_id:
+                continue
+            base_url: str = f"{server_url}/news_page_{fixture_id}"
+            resolvers[int(fixture_id)] = recorded_site(
+                version, int(fixture_id), base_url
+            )
+            news_pages_list.append(
+                NewsPage(
+                    id=int(fixture_id),
+                    name=news_page["name"],
+                    url=base_url + get_listing_path(news_page["url"]),
+                )
+            )
+        return news_pages_list, date.fromisoformat(manifest["recorded_on"])
+
+    @staticmethod
+    def scrape(news_pages_list: list[NewsPage], target_date: date) -> int:
+        """
+        Scrape the given news pages inside a transaction that is rolled back,
+        forgetting their last listing so none is skipped as unchanged.
+        """
+
+        with transaction.atomic():
+            for news_page in news_pages_list:
+                NewsPage.objects.update_or_create(
+                    id=news_page.id,
+                    defaults={
+                        "name": news_page.name,
+                        "url": news_page.url,
+                        "etag": "",
+                        "last_modified": "",
+                        "content_hash": "",
+                    },
+                )
+            created: int = fetch_new_articles(
+                target_date, [news_page.id for news_page in news_pages_list]
+            )
+            transaction.set_rollback(True)
+        return created
+
+    def run_profiled(
+        self, news_pages_list: list[NewsPage], target_date: date
+    ) -> tuple[pstats.Stats, dict[str, float], float]:
+        """
+        Scrape the given news pages under cProfile, including the threads that
+        download the pages, and return the profile, the seconds spent on each
+        phase and the wall time.
+        """
+
+        thread_profilers_list: list[cProfile.Profile] = []
+        thread_profilers_lock = threading.Lock()
+
+        def start_thread_profiler(*args) -> None:
+            # Only the executor threads downloading the news pages, not the
+            # ones of the fixtures server.
+            if not threading.current_thread().name.startswith("ThreadPoolExecutor"):
+                sys.setprofile(None)
+                return
+            thread_profiler = cProfile.Profile()
+            with thread_profilers_lock:
+                thread_profilers_list.append(thread_profiler)
+            thread_profiler.enable()
+
+        profiler = cProfile.Profile()
+        with recording() as timings:
+            started: float = time.perf_counter()
+            threading.setprofile(start_thread_profiler)
+            profiler.enable()
+            try:
+                created: int = self.scrape(news_pages_list, target_date)
+            finally:
+                profiler.disable()
+                threading.setprofile(None)
+            wall: float = time.perf_counter() - started
+
+        profile_stats = pstats.Stats(profiler)
+        for thread_profiler in thread_profilers_list:
+            profile_stats.add(thread_profiler)
+        self.stdout.write(f"Scraped {created} new articles in {wall:.2f} s.")
+        return profile_stats, dict(timings), wall
+
+    def run_traced(
+        self, news_pages_list: list[NewsPage], target_date: date
+    ) -> tuple[int, list[tracemalloc.StatisticDiff]]:
+        """
+        Scrape the given news pages again tracing memory, apart from cProfile
+        so neither skews the other. Return the peak traced memory and the
+        memory retained afterwards by allocation site, largest first, which
+        leaves out what was freed during the scrape.
+        """
+
+        # With DEBUG on, the queries every connection logs would be most of the
+        # retained memory, so they are not logged while tracing.
+        reset_queries()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            with override_settings(DEBUG=False):
+                self.scrape(news_pages_list, target_date)
+            after = tracemalloc.take_snapshot()
+            peak_memory: int = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        filters_list: list[tracemalloc.Filter] = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ]
+        return peak_memory, after.filter_traces(filters_list).compare_to(
+            before.filter_traces(filters_list), "lineno"
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from scraper.benchmarks.fixtures import get_versions, record_fixtures
+from scraper.models import NewsPage
+
+
+class Command(BaseCommand):
+    help = (
+        "Record the live listing and detail pages of every news page as a new "
+        "fixture version for benchmark_scraper."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("version", help="Name of the new fixture version.")
+
+    def handle(self, *args, **options) -> None:
+        if options["version"] in get_versions():
+            raise CommandError(f"Fixture version {options['version']} already exists.")
+
+        manifest: dict = record_fixtures(
+            options["version"], list(NewsPage.objects.all())
+        )
+        for news_page in manifest["news_pages"].values():
+            self.stdout.write(
+                f"{news_page['name']}: {len(news_page['pages'])} pages, "
+                f"{news_page['articles']} articles."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Fixture version {options['version']} recorded.")
+        )
@@ -0,0 +1,185 @@
+import logging
+import re
+import threading
+from collections import defaultdict
+
+from redis.exceptions import RedisError
+
+from scraper.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Redis hash holding every sample, shared by the web server and the workers.
+METRICS_KEY: str = "ezalor:metrics"
+# Upper bounds in seconds of the histogram buckets.
+BUCKETS: tuple = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+METRICS: dict[str, tuple[str, str]] = {
+    "ezalor_scrape_seconds": (
+        "histogram",
+        "Seconds spent scraping a news page.",
+    ),
+    "ezalor_scrape_phase_seconds": (
+        "histogram",
+        "Seconds spent on each phase of scraping a news page.",
+    ),
+    "ezalor_scrape_articles_total": (
+        "counter",
+        "Articles created from a news page.",
+    ),
+    "ezalor_scrape_failures_total": (
+        "counter",
+        "Scrapes of a news page that failed after their retries.",
+    ),
+    "ezalor_graph_api_request_seconds": (
+        "histogram",
+        "Seconds taken by the Graph API to answer a page or profile request.",
+    ),
+    "ezalor_graph_api_errors_total": (
+        "counter",
+        "Graph API errors of a page or profile by kind.",
+    ),
+    "ezalor_posts_published_total": (
+        "counter",
+        "Posts published to a page or profile.",
+    ),
+    "ezalor_task_seconds": (
+        "histogram",
+        "Seconds a Celery task ran, by final state.",
+    ),
+    "ezalor_task_retries_total": (
+        "counter",
+        "Celery task retries.",
+    ),
+}
+
+_local_samples: dict[str, float] = defaultdict(float)
+_local_lock = threading.Lock()
+
+
+def get_labels(labels: dict[str, str]) -> str:
+    """
+    Return the given labels in the Prometheus text format.
+    """
+
+    if not labels:
+        return ""
+    values_list: list[str] = [
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in sorted(labels.items())
+    ]
+    return "{" + ",".join(values_list) + "}"
+
+
+def add_samples(samples: dict[str, float]) -> None:
+    """
+    Add the given values to their samples, in Redis if available so every
+    process adds to the same ones, or in the current process otherwise.
+    Metrics never make the instrumented code fail.
+    """
+
+    client = get_redis()
+    if client is not None:
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for sample, value in samples.items():
+                pipeline.hincrbyfloat(METRICS_KEY, sample, value)
+            pipeline.execute()
+            return
+        except RedisError as exc:
+            logger.warning(f"Metrics unavailable, using local metrics: {exc}")
+
+    with _local_lock:
+        for sample, value in samples.items():
+            _local_samples[sample] += value
+
+
+def inc(name: str, labels: dict[str, str], value: float = 1) -> None:
+    """
+    Add the given value to the counter of the given name and labels.
+    """
+
+    add_samples({f"{name}{get_labels(labels)}": value})
+
+
+def observe(name: str, labels: dict[str, str], seconds: float) -> None:
+    """
+    Add the given seconds to the histogram of the given name and labels.
+    """
+
+    samples: dict[str, float] = {
+        f"{name}_bucket{get_labels({**labels, 'le': str(bound)})}": 1
+        for bound in BUCKETS
+        if seconds <= bound
+    }
+    samples[f"{name}_bucket{get_labels({**labels, 'le': '+Inf'})}"] = 1
+    samples[f"{name}_sum{get_labels(labels)}"] = seconds
+    samples[f"{name}_count{get_labels(labels)}"] = 1
+    add_samples(samples)
+
+
+def get_samples() -> dict[str, float]:
+    """
+    Return the value of every metric sample, from Redis or from this process
+    if it's unavailable.
+    """
+
+    client = get_redis()
+    if client is not None:
+        try:
+            return {
+                sample.decode(): float(value)
+                for sample, value in client.hgetall(METRICS_KEY).items()
+            }
+        except RedisError as exc:
+            logger.warning(f"Metrics unavailable, using local metrics: {exc}")
+
+    with _local_lock:
+        return dict(_local_samples)
+
+
+def get_metric_name(sample: str) -> str:
+    """
+    Return the name of the metric of the given sample, without the suffix of
+    histogram series.
+    """
+
+    sample_name: str = sample.split("{", 1)[0]
+    for suffix in ("_bucket", "_sum", "_count"):
+        if sample_name.endswith(suffix) and sample_name not in METRICS:
+            return sample_name.removesuffix(suffix)
+    return sample_name
+
+
+def get_sort_key(sample: str) -> tuple[str, float]:
+    """
+    Sort histogram buckets by their upper bound, after their series.
+    """
+
+    match = re.search(r'le="([^"]+)"', sample)
+    if match is None:
+        return sample, 0.0
+    return sample.replace(match.group(0), ""), float(match.group(1))
+
+
+def render() -> str:
+    """
+    Return every metric in the Prometheus text exposition format.
+    """
+
+    samples_dict: dict[str, list[str]] = defaultdict(list)
+    for sample, value in sorted(
+        get_samples().items(), key=lambda item: get_sort_key(item[0])
+    ):
+        samples_dict[get_metric_name(sample)].append(f"{sample} {value!r}")
+
+    lines_list: list[str] = []
+    for name, (metric_type, description) in METRICS.items():
+        lines_list += [
+            f"# HELP {name} {description}",
+            f"# TYPE {name} {metric_type}",
+            *samples_dict[name],
+        ]
+    return "\n".join(lines_list) + "\n"
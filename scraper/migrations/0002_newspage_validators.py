@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspage",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=64,
+                verbose_name="Hash del contenido",
+            ),
+        ),
+        migrations.AddField(
+            model_name="newspage",
+            name="etag",
+            field=models.CharField(
+                blank=True, editable=False, max_length=200, verbose_name="ETag"
+            ),
+        ),
+        migrations.AddField(
+            model_name="newspage",
+            name="last_modified",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=100,
+                verbose_name="Última modificación",
+            ),
+        ),
+    ]
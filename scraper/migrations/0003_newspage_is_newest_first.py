@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0002_newspage_validators"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspage",
+            name="is_newest_first",
+            field=models.BooleanField(
+                default=True,
+                help_text="Los artículos se listan del más nuevo al más antiguo, por lo que la búsqueda se detiene en el primer artículo anterior a la fecha buscada.",
+                verbose_name="Ordenada por fecha",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0003_newspage_is_newest_first"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="instagrampost",
+            name="container_id",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=200,
+                null=True,
+                verbose_name="ID de contenedor",
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0004_instagrampost_container_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="facebookpage",
+            name="broken_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Token roto desde"
+            ),
+        ),
+        migrations.AddField(
+            model_name="facebookpage",
+            name="broken_reason",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Motivo del error"
+            ),
+        ),
+        migrations.AddField(
+            model_name="instagramprofile",
+            name="broken_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Token roto desde"
+            ),
+        ),
+        migrations.AddField(
+            model_name="instagramprofile",
+            name="broken_reason",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Motivo del error"
+            ),
+        ),
+    ]
@@ -0,0 +1,118 @@
+from django.db import migrations, models
+
+
+def set_status(apps, schema_editor):
+    """
+    Set the status of the existing posts from their post and container IDs.
+    """
+
+    for model_name in ("FacebookPost", "InstagramPost"):
+        model = apps.get_model("scraper", model_name)
+        model.objects.filter(post_id__isnull=False).update(status="published")
+        model.objects.filter(post_id__isnull=True).update(status="failed")
+    apps.get_model("scraper", "InstagramPost").objects.filter(
+        post_id__isnull=True, container_id__isnull=False
+    ).update(status="processing")
+
+
+def delete_duplicate_posts(apps, schema_editor):
+    """
+    Keep a single post per article and page or profile before they are made
+    unique, the published one if any, and delete the rest.
+    """
+
+    for model_name, target in (("FacebookPost", "page"), ("InstagramPost", "profile")):
+        model = apps.get_model("scraper", model_name)
+        duplicates = (
+            model.objects.values("article_id", f"{target}_id")
+            .annotate(total=models.Count("id"))
+            .filter(total__gt=1)
+        )
+        for duplicate in duplicates:
+            posts_list: list = sorted(
+                model.objects.filter(
+                    article_id=duplicate["article_id"],
+                    **{f"{target}_id": duplicate[f"{target}_id"]},
+                ),
+                key=lambda post: (post.post_id is None, post.id),
+            )
+            model.objects.filter(pk__in=[post.id for post in posts_list[1:]]).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0005_publishing_target_broken"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="facebookpost",
+            name="error",
+            field=models.TextField(blank=True, verbose_name="Error"),
+        ),
+        migrations.AddField(
+            model_name="facebookpost",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pendiente"),
+                    ("processing", "En proceso"),
+                    ("published", "Publicada"),
+                    ("failed", "Fallida"),
+                ],
+                default="pending",
+                max_length=20,
+                verbose_name="Estado",
+            ),
+        ),
+        migrations.AddField(
+            model_name="instagrampost",
+            name="error",
+            field=models.TextField(blank=True, verbose_name="Error"),
+        ),
+        migrations.AddField(
+            model_name="instagrampost",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pendiente"),
+                    ("processing", "En proceso"),
+                    ("published", "Publicada"),
+                    ("failed", "Fallida"),
+                ],
+                default="pending",
+                max_length=20,
+                verbose_name="Estado",
+            ),
+        ),
+        migrations.RunPython(set_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="facebookpost",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["page", "id"],
+                name="facebookpost_pending_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instagrampost",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["profile", "id"],
+                name="instagrampost_pending_idx",
+            ),
+        ),
+        migrations.RunPython(delete_duplicate_posts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="facebookpost",
+            constraint=models.UniqueConstraint(
+                fields=("article", "page"), name="unique_facebook_post"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="instagrampost",
+            constraint=models.UniqueConstraint(
+                fields=("article", "profile"), name="unique_instagram_post"
+            ),
+        ),
+    ]
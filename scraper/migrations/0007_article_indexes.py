@@ -0,0 +1,45 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0006_post_status"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["post_date", "id"], name="article_post_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["news_page", "post_date", "id"],
+                name="article_news_page_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_facebook", False), ("is_instagram", False), _connector="OR"
+                ),
+                fields=["post_date", "id"],
+                name="article_unposted_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="article",
+            name="news_page",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="articles",
+                to="scraper.newspage",
+                verbose_name="Página de noticias",
+            ),
+        ),
+    ]
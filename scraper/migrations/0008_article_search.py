@@ -0,0 +1,125 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Spanish configuration ignoring accents, so "elección" matches "eleccion".
+POSTGRESQL_FORWARD: list[str] = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE TEXT SEARCH CONFIGURATION ezalor_spanish (COPY = spanish)",
+    """
+    ALTER TEXT SEARCH CONFIGURATION ezalor_spanish
+        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem
+    """,
+    """
+    CREATE FUNCTION scraper_article_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('ezalor_spanish', coalesce(NEW.title, '')), 'A')
+            || setweight(to_tsvector('ezalor_spanish', coalesce(NEW.body, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER scraper_article_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, body, search_vector ON scraper_article
+        FOR EACH ROW EXECUTE FUNCTION scraper_article_search_vector_update()
+    """,
+    "UPDATE scraper_article SET search_vector = NULL",
+    """
+    CREATE INDEX article_search_idx ON scraper_article
+        USING gin (search_vector)
+    """,
+    """
+    CREATE INDEX article_title_trgm_idx ON scraper_article
+        USING gin (title gin_trgm_ops)
+    """,
+]
+POSTGRESQL_BACKWARD: list[str] = [
+    "DROP INDEX IF EXISTS article_title_trgm_idx",
+    "DROP INDEX IF EXISTS article_search_idx",
+    "DROP TRIGGER IF EXISTS scraper_article_search_vector_trigger ON scraper_article",
+    "DROP FUNCTION IF EXISTS scraper_article_search_vector_update()",
+    "DROP TEXT SEARCH CONFIGURATION IF EXISTS ezalor_spanish",
+]
+
+# External content FTS5 table kept in sync with the article table by triggers.
+SQLITE_FORWARD: list[str] = [
+    """
+    CREATE VIRTUAL TABLE scraper_article_fts USING fts5(
+        title, body, content='scraper_article', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER scraper_article_fts_insert AFTER INSERT ON scraper_article
+    BEGIN
+        INSERT INTO scraper_article_fts(rowid, title, body)
+            VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER scraper_article_fts_delete AFTER DELETE ON scraper_article
+    BEGIN
+        INSERT INTO scraper_article_fts(scraper_article_fts, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER scraper_article_fts_update AFTER UPDATE OF title, body
+        ON scraper_article
+    BEGIN
+        INSERT INTO scraper_article_fts(scraper_article_fts, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO scraper_article_fts(rowid, title, body)
+            VALUES (new.id, new.title, new.body);
+    END
+    """,
+    "INSERT INTO scraper_article_fts(scraper_article_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD: list[str] = [
+    "DROP TRIGGER IF EXISTS scraper_article_fts_update",
+    "DROP TRIGGER IF EXISTS scraper_article_fts_delete",
+    "DROP TRIGGER IF EXISTS scraper_article_fts_insert",
+    "DROP TABLE IF EXISTS scraper_article_fts",
+]
+
+
+def create_search(apps, schema_editor):
+    """
+    Create the database objects searching articles, which depend on the
+    database vendor.
+    """
+
+    statements_list: list[str] = {
+        "postgresql": POSTGRESQL_FORWARD,
+        "sqlite": SQLITE_FORWARD,
+    }.get(schema_editor.connection.vendor, [])
+    for statement in statements_list:
+        schema_editor.execute(statement)
+
+
+def delete_search(apps, schema_editor):
+    statements_list: list[str] = {
+        "postgresql": POSTGRESQL_BACKWARD,
+        "sqlite": SQLITE_BACKWARD,
+    }.get(schema_editor.connection.vendor, [])
+    for statement in statements_list:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0007_article_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True, verbose_name="Vector de búsqueda"
+            ),
+        ),
+        migrations.RunPython(create_search, delete_search),
+    ]
@@ -0,0 +1,153 @@
+import hashlib
+import re
+import struct
+import unicodedata
+from datetime import date, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of scraper.duplicates when this migration was written, so later
+# changes to the fingerprints or settings don't change what it does.
+PERMUTATIONS: int = 32
+BANDS: int = 16
+ROWS: int = PERMUTATIONS // BANDS
+VALUE_BITS: int = 56
+STOP_WORDS: frozenset = frozenset(
+    "al como con de del el en es esta la las lo los mas para pero por que se "
+    "sin su sus un una y".split()
+)
+WINDOW_DAYS: int = 2
+
+
+def get_hash(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+
+
+def get_shingles(title: str, body: str) -> set[str]:
+    text: str = unicodedata.normalize("NFKD", f"{title} {body}".lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    words_list: list[str] = [
+        word for word in re.findall(r"\w+", text) if word not in STOP_WORDS
+    ]
+    if len(words_list) < 2:
+        return set(words_list)
+    return {
+        f"{word} {next_word}" for word, next_word in zip(words_list, words_list[1:])
+    }
+
+
+def get_fingerprint(title: str, body: str) -> bytes | None:
+    signature: list[int | None] = [None] * PERMUTATIONS
+    for shingle in get_shingles(title, body):
+        shingle_hash: int = get_hash(shingle.encode())
+        index: int = shingle_hash % PERMUTATIONS
+        value: int = shingle_hash >> 8 & (1 << VALUE_BITS) - 1
+        if signature[index] is None or value < signature[index]:
+            signature[index] = value
+    if all(value is None for value in signature):
+        return None
+
+    for index in range(PERMUTATIONS):
+        offset: int = 1
+        while signature[index] is None:
+            borrowed: int | None = signature[(index + offset) % PERMUTATIONS]
+            if borrowed is not None and borrowed < 1 << VALUE_BITS:
+                signature[index] = borrowed + (offset << VALUE_BITS)
+            offset += 1
+    return struct.pack(f">{PERMUTATIONS}Q", *signature)
+
+
+def get_band_values(fingerprint: bytes) -> list[int]:
+    signature: tuple[int, ...] = struct.unpack(f">{PERMUTATIONS}Q", fingerprint)
+    values_list: list[int] = []
+    for band in range(BANDS):
+        value: int = get_hash(
+            struct.pack(f">H{ROWS}Q", band, *signature[band * ROWS : (band + 1) * ROWS])
+        )
+        values_list.append(value - (1 << 64) if value >= 1 << 63 else value)
+    return values_list
+
+
+def set_fingerprints(apps, schema_editor):
+    """
+    Fingerprint the articles new ones are still compared with. They are not
+    marked as duplicates, since most of them are already posted.
+    """
+
+    Article = apps.get_model("scraper", "Article")
+    FingerprintBand = apps.get_model("scraper", "FingerprintBand")
+    articles = Article.objects.filter(
+        post_date__gte=date.today() - timedelta(days=WINDOW_DAYS)
+    )
+    for article in articles.only("title", "body").iterator(chunk_size=1000):
+        article.fingerprint = get_fingerprint(article.title, article.body)
+        if article.fingerprint is None:
+            continue
+        article.save(update_fields=["fingerprint"])
+        FingerprintBand.objects.bulk_create(
+            FingerprintBand(article=article, band=band, value=value)
+            for band, value in enumerate(get_band_values(article.fingerprint))
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0008_article_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="scraper.article",
+                verbose_name="Duplicado de",
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="fingerprint",
+            field=models.BinaryField(blank=True, null=True, verbose_name="Huella"),
+        ),
+        migrations.CreateModel(
+            name="FingerprintBand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("band", models.PositiveSmallIntegerField(verbose_name="Banda")),
+                ("value", models.BigIntegerField(db_index=True, verbose_name="Valor")),
+                (
+                    "article",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fingerprint_bands",
+                        to="scraper.article",
+                        verbose_name="Artículo",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Banda de huella",
+                "verbose_name_plural": "Bandas de huella",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("article", "band"), name="unique_fingerprint_band"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(set_fingerprints, migrations.RunPython.noop),
+    ]
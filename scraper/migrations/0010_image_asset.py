@@ -0,0 +1,67 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0009_article_duplicates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageAsset",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "checksum",
+                    models.CharField(
+                        max_length=64, unique=True, verbose_name="Checksum"
+                    ),
+                ),
+                (
+                    "source_url",
+                    models.URLField(
+                        db_index=True, max_length=500, verbose_name="URL de origen"
+                    ),
+                ),
+                (
+                    "facebook_image",
+                    models.ImageField(upload_to="", verbose_name="Imagen de Facebook"),
+                ),
+                (
+                    "instagram_image",
+                    models.ImageField(upload_to="", verbose_name="Imagen de Instagram"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Fecha de creación"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Imagen",
+                "verbose_name_plural": "Imágenes",
+            },
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="image_asset",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="articles",
+                to="scraper.imageasset",
+                verbose_name="Imagen procesada",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0010_image_asset"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskResultDailySummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Día")),
+                ("task_name", models.CharField(max_length=255, verbose_name="Tarea")),
+                ("status", models.CharField(max_length=50, verbose_name="Estado")),
+                (
+                    "count",
+                    models.PositiveIntegerField(default=0, verbose_name="Cantidad"),
+                ),
+            ],
+            options={
+                "verbose_name": "Resumen diario de tareas",
+                "verbose_name_plural": "Resúmenes diarios de tareas",
+                "ordering": ("-day", "task_name", "status"),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "task_name", "status"),
+                        name="unique_task_result_daily_summary",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+import scraper.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0011_task_result_daily_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspage",
+            name="pagination_url",
+            field=models.URLField(
+                blank=True,
+                help_text="URL de las siguientes páginas del listado, con {page} en lugar del número de página. Vacía si el listado tiene una sola página.",
+                validators=[scraper.models.validate_pagination_url],
+                verbose_name="URL de paginación",
+            ),
+        ),
+        migrations.CreateModel(
+            name="BackfillCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("since", models.DateField(verbose_name="Desde")),
+                ("until", models.DateField(verbose_name="Hasta")),
+                (
+                    "first_page",
+                    models.PositiveIntegerField(verbose_name="Primera página"),
+                ),
+                (
+                    "last_page",
+                    models.PositiveIntegerField(verbose_name="Última página"),
+                ),
+                (
+                    "next_page",
+                    models.PositiveIntegerField(verbose_name="Siguiente página"),
+                ),
+                (
+                    "created_articles",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Artículos creados"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Fecha de finalización"
+                    ),
+                ),
+                (
+                    "news_page",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="backfill_checkpoints",
+                        to="scraper.newspage",
+                        verbose_name="Página de noticias",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Punto de control de carga histórica",
+                "verbose_name_plural": "Puntos de control de carga histórica",
+                "ordering": ("news_page", "since", "until", "first_page"),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("news_page", "since", "until", "first_page"),
+                        name="unique_backfill_checkpoint",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0012_backfill"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="facebookpost",
+            name="processing_started_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Inicio del procesamiento",
+            ),
+        ),
+        migrations.AddField(
+            model_name="instagrampost",
+            name="processing_started_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Inicio del procesamiento",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="facebookpost",
+            index=models.Index(
+                condition=models.Q(("status", "processing")),
+                fields=["processing_started_at"],
+                name="facebookpost_processing_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instagrampost",
+            index=models.Index(
+                condition=models.Q(("status", "processing")),
+                fields=["processing_started_at"],
+                name="instagrampost_processing_idx",
+            ),
+        ),
+    ]
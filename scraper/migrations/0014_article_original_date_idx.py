@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0013_post_processing_started_at"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="article",
+            name="article_unposted_idx",
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("duplicate_of__isnull", True)),
+                fields=["post_date"],
+                name="article_original_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraper", "0014_article_original_date_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="facebookpost",
+            name="task_id",
+            field=models.CharField(
+                blank=True, editable=False, max_length=255, verbose_name="Tarea"
+            ),
+        ),
+        migrations.AddField(
+            model_name="instagrampost",
+            name="task_id",
+            field=models.CharField(
+                blank=True, editable=False, max_length=255, verbose_name="Tarea"
+            ),
+        ),
+    ]
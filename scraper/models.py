@@ -1,9 +1,21 @@
 from datetime import date, datetime
 
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.safestring import mark_safe
 
 
+def validate_pagination_url(value: str) -> None:
+    """
+    Check the given pagination URL has the {page} placeholder.
+    """
+
+    if "{page}" not in value:
+        raise ValidationError("La URL debe contener {page}.")
+
+
 class NewsPage(models.Model):
     """
     Store a single news page instance, related to :model:`scraper.Article`.
@@ -11,6 +23,28 @@ class NewsPage(models.Model):
 
     name: str = models.CharField(verbose_name="Nombre", max_length=200)
     url: str = models.URLField(verbose_name="URL")
+    is_newest_first: bool = models.BooleanField(
+        verbose_name="Ordenada por fecha",
+        default=True,
+        help_text="Los artículos se listan del más nuevo al más antiguo, por lo que "
+        "la búsqueda se detiene en el primer artículo anterior a la fecha buscada.",
+    )
+    etag: str = models.CharField(
+        verbose_name="ETag", max_length=200, blank=True, editable=False
+    )
+    last_modified: str = models.CharField(
+        verbose_name="Última modificación", max_length=100, blank=True, editable=False
+    )
+    content_hash: str = models.CharField(
+        verbose_name="Hash del contenido", max_length=64, blank=True, editable=False
+    )
+    pagination_url: str = models.URLField(
+        verbose_name="URL de paginación",
+        blank=True,
+        validators=(validate_pagination_url,),
+        help_text="URL de las siguientes páginas del listado, con {page} en lugar "
+        "del número de página. Vacía si el listado tiene una sola página.",
+    )
 
     class Meta:
         verbose_name: str = "Página de noticias"
@@ -20,12 +54,64 @@ class NewsPage(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    def get_page_url(self, page_number: int) -> str:
+        """
+        Return the URL of the given page of the listing, starting from 1.
+        """
+
+        if page_number == 1:
+            return self.url
+        return self.pagination_url.replace("{page}", str(page_number))
+
+
+class PublishingTarget(models.Model):
+    """
+    Abstract model of the pages and profiles articles are published to. Their
+    publishing stops while their token is broken, until the token is changed.
+    """
 
-class FacebookPage(models.Model):
+    token_field: str = ""
+
+    broken_at: datetime = models.DateTimeField(
+        verbose_name="Token roto desde", blank=True, null=True, editable=False
+    )
+    broken_reason: str = models.TextField(
+        verbose_name="Motivo del error", blank=True, editable=False
+    )
+
+    class Meta:
+        abstract: bool = True
+
+    def save(self, *args, **kwargs) -> None:
+        if self.pk and self.broken_at:
+            previous_token: str | None = (
+                type(self)
+                .objects.filter(pk=self.pk)
+                .values_list(self.token_field, flat=True)
+                .first()
+            )
+            if previous_token != getattr(self, self.token_field):
+                self.broken_at = None
+                self.broken_reason = ""
+        super().save(*args, **kwargs)
+
+    def set_broken(self, reason: str) -> None:
+        """
+        Stop publishing to this target until its token is changed.
+        """
+
+        self.broken_at = timezone.now()
+        self.broken_reason = reason
+        self.save(update_fields=["broken_at", "broken_reason"])
+
+
+class FacebookPage(PublishingTarget):
     """
     Store a single Facebook page instance.
     """
 
+    token_field: str = "page_token"
+
     name: str = models.CharField(verbose_name="Nombre", max_length=100)
     page_id: str = models.CharField(
         verbose_name="ID de página", max_length=100, unique=True
@@ -47,11 +133,13 @@ class FacebookPage(models.Model):
         return self.name
 
 
-class InstagramProfile(models.Model):
+class InstagramProfile(PublishingTarget):
     """
     Store a single Instagram profile instance.
     """
 
+    token_field: str = "user_token"
+
     name: str = models.CharField(verbose_name="Nombre", max_length=100)
     user_id: str = models.CharField(
         verbose_name="ID de usuario", max_length=100, unique=True
@@ -73,6 +161,34 @@ class InstagramProfile(models.Model):
         return self.name
 
 
+class ImageAsset(models.Model):
+    """
+    Store a single image downloaded once from its source URL and resized for
+    Facebook and Instagram, related to :model:`scraper.Article`. Files are
+    named after the checksum of the downloaded image, so the same image is
+    stored once whatever its URL.
+    """
+
+    checksum: str = models.CharField(
+        verbose_name="Checksum", max_length=64, unique=True
+    )
+    source_url: str = models.URLField(
+        verbose_name="URL de origen", max_length=500, db_index=True
+    )
+    facebook_image: str = models.ImageField(verbose_name="Imagen de Facebook")
+    instagram_image: str = models.ImageField(verbose_name="Imagen de Instagram")
+    created_at: datetime = models.DateTimeField(
+        verbose_name="Fecha de creación", auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name: str = "Imagen"
+        verbose_name_plural: str = "Imágenes"
+
+    def __str__(self) -> str:
+        return self.checksum
+
+
 class Article(models.Model):
     """
     Store a single article instance, related to :model:`scraper.NewsPage`.
@@ -84,6 +200,7 @@ class Article(models.Model):
         verbose_name="Página de noticias",
         on_delete=models.RESTRICT,
         related_name="articles",
+        db_index=False,
     )
     url: str = models.URLField(verbose_name="URL")
     title: str = models.CharField(verbose_name="Título", max_length=200)
@@ -92,6 +209,30 @@ class Article(models.Model):
     body: str = models.TextField(verbose_name="Cuerpo")
     is_facebook: bool = models.BooleanField(verbose_name="Facebook", default=False)
     is_instagram: bool = models.BooleanField(verbose_name="Instagram", default=False)
+    image_asset: int = models.ForeignKey(
+        ImageAsset,
+        verbose_name="Imagen procesada",
+        on_delete=models.SET_NULL,
+        related_name="articles",
+        blank=True,
+        null=True,
+    )
+    # Maintained by a database trigger on PostgreSQL, see scraper.search.
+    search_vector: str = SearchVectorField(
+        verbose_name="Vector de búsqueda", blank=True, null=True, editable=False
+    )
+    # MinHash signature of the title and body, see scraper.duplicates.
+    fingerprint: bytes = models.BinaryField(
+        verbose_name="Huella", blank=True, null=True, editable=False
+    )
+    duplicate_of: int = models.ForeignKey(
+        "self",
+        verbose_name="Duplicado de",
+        on_delete=models.SET_NULL,
+        related_name="duplicates",
+        blank=True,
+        null=True,
+    )
 
     class Meta:
         verbose_name: str = "Artículo"
@@ -104,11 +245,106 @@ class Article(models.Model):
             "-post_date",
             "-id",
         )
+        indexes: tuple = (
+            models.Index(fields=("post_date", "id"), name="article_post_date_idx"),
+            models.Index(
+                fields=("news_page", "post_date", "id"),
+                name="article_news_page_date_idx",
+            ),
+            models.Index(
+                fields=("post_date",),
+                condition=models.Q(duplicate_of__isnull=True),
+                name="article_original_date_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return self.title
 
 
+class FingerprintBand(models.Model):
+    """
+    Store the hash of a band of the fingerprint of a :model:`scraper.Article`
+    instance, which near-duplicate articles share.
+    """
+
+    article: int = models.ForeignKey(
+        Article,
+        verbose_name="Artículo",
+        on_delete=models.CASCADE,
+        related_name="fingerprint_bands",
+        db_index=False,
+    )
+    band: int = models.PositiveSmallIntegerField(verbose_name="Banda")
+    value: int = models.BigIntegerField(verbose_name="Valor", db_index=True)
+
+    class Meta:
+        verbose_name: str = "Banda de huella"
+        verbose_name_plural: str = "Bandas de huella"
+        constraints: tuple = (
+            models.UniqueConstraint(
+                fields=("article", "band"), name="unique_fingerprint_band"
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.article_id} - {self.band}"
+
+
+class BackfillCheckpoint(models.Model):
+    """
+    Store the progress of backfilling the articles of a
+    :model:`scraper.NewsPage` posted in a date range from a range of its
+    listing pages, so an interrupted backfill resumes where it stopped.
+    """
+
+    news_page: int = models.ForeignKey(
+        NewsPage,
+        verbose_name="Página de noticias",
+        on_delete=models.CASCADE,
+        related_name="backfill_checkpoints",
+    )
+    since: date = models.DateField(verbose_name="Desde")
+    until: date = models.DateField(verbose_name="Hasta")
+    first_page: int = models.PositiveIntegerField(verbose_name="Primera página")
+    last_page: int = models.PositiveIntegerField(verbose_name="Última página")
+    next_page: int = models.PositiveIntegerField(verbose_name="Siguiente página")
+    created_articles: int = models.PositiveIntegerField(
+        verbose_name="Artículos creados", default=0
+    )
+    finished_at: datetime = models.DateTimeField(
+        verbose_name="Fecha de finalización", null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name: str = "Punto de control de carga histórica"
+        verbose_name_plural: str = "Puntos de control de carga histórica"
+        ordering: tuple = ("news_page", "since", "until", "first_page")
+        constraints: tuple = (
+            models.UniqueConstraint(
+                fields=("news_page", "since", "until", "first_page"),
+                name="unique_backfill_checkpoint",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.news_page_id} - {self.since} - {self.until} - "
+            f"{self.first_page}-{self.last_page}"
+        )
+
+
+class PostStatus(models.TextChoices):
+    """
+    Publishing state of a post of an article in a page or profile.
+    """
+
+    PENDING = "pending", "Pendiente"
+    PROCESSING = "processing", "En proceso"
+    PUBLISHED = "published", "Publicada"
+    FAILED = "failed", "Fallida"
+
+
 class FacebookPost(models.Model):
     """
     Store a single Facebook post instance, related to :model:`scraper.Article`
@@ -133,11 +369,42 @@ class FacebookPost(models.Model):
     post_id: str = models.CharField(
         verbose_name="ID de publicación", max_length=200, blank=True, null=True
     )
+    status: str = models.CharField(
+        verbose_name="Estado",
+        max_length=20,
+        choices=PostStatus.choices,
+        default=PostStatus.PENDING,
+    )
+    error: str = models.TextField(verbose_name="Error", blank=True)
+    processing_started_at: datetime = models.DateTimeField(
+        verbose_name="Inicio del procesamiento", blank=True, null=True, editable=False
+    )
+    # Celery task publishing the post, so no other task publishes it as well.
+    task_id: str = models.CharField(
+        verbose_name="Tarea", max_length=255, blank=True, editable=False
+    )
 
     class Meta:
         verbose_name: str = "Publicación en Facebook"
         verbose_name_plural: str = "Publicaciones en Facebook"
         ordering: tuple = ("post_id", "article")
+        constraints: tuple = (
+            models.UniqueConstraint(
+                fields=("article", "page"), name="unique_facebook_post"
+            ),
+        )
+        indexes: tuple = (
+            models.Index(
+                fields=("page", "id"),
+                condition=models.Q(status=PostStatus.PENDING),
+                name="facebookpost_pending_idx",
+            ),
+            models.Index(
+                fields=("processing_started_at",),
+                condition=models.Q(status=PostStatus.PROCESSING),
+                name="facebookpost_processing_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return self.article.title
@@ -167,11 +434,76 @@ class InstagramPost(models.Model):
     post_id: str = models.CharField(
         verbose_name="ID de publicación", max_length=200, blank=True, null=True
     )
+    container_id: str = models.CharField(
+        verbose_name="ID de contenedor",
+        max_length=200,
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    status: str = models.CharField(
+        verbose_name="Estado",
+        max_length=20,
+        choices=PostStatus.choices,
+        default=PostStatus.PENDING,
+    )
+    error: str = models.TextField(verbose_name="Error", blank=True)
+    processing_started_at: datetime = models.DateTimeField(
+        verbose_name="Inicio del procesamiento", blank=True, null=True, editable=False
+    )
+    # Celery task publishing the post, so no other task publishes it as well.
+    task_id: str = models.CharField(
+        verbose_name="Tarea", max_length=255, blank=True, editable=False
+    )
 
     class Meta:
         verbose_name: str = "Publicación en Instagram"
         verbose_name_plural: str = "Publicaciones en Instagram"
         ordering: tuple = ("post_id", "article")
+        constraints: tuple = (
+            models.UniqueConstraint(
+                fields=("article", "profile"), name="unique_instagram_post"
+            ),
+        )
+        indexes: tuple = (
+            models.Index(
+                fields=("profile", "id"),
+                condition=models.Q(status=PostStatus.PENDING),
+                name="instagrampost_pending_idx",
+            ),
+            models.Index(
+                fields=("processing_started_at",),
+                condition=models.Q(status=PostStatus.PROCESSING),
+                name="instagrampost_processing_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return self.article.title
+
+
+class TaskResultDailySummary(models.Model):
+    """
+    Store the number of Celery task results of a task and state finished on a
+    single day, which old task results are rolled up into before being
+    deleted.
+    """
+
+    day: date = models.DateField(verbose_name="Día")
+    task_name: str = models.CharField(verbose_name="Tarea", max_length=255)
+    status: str = models.CharField(verbose_name="Estado", max_length=50)
+    count: int = models.PositiveIntegerField(verbose_name="Cantidad", default=0)
+
+    class Meta:
+        verbose_name: str = "Resumen diario de tareas"
+        verbose_name_plural: str = "Resúmenes diarios de tareas"
+        ordering: tuple = ("-day", "task_name", "status")
+        constraints: tuple = (
+            models.UniqueConstraint(
+                fields=("day", "task_name", "status"),
+                name="unique_task_result_daily_summary",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.day} - {self.task_name} - {self.status}"
@@ -0,0 +1,195 @@
+import locale
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterator
+
+from lxml import etree, html
+
+from scraper.models import NewsPage
+
+locale.setlocale(locale.LC_TIME, "es_AR.UTF-8")
+
+CNN_IMAGE_URL: str = "https://i.postimg.cc/vB77SY4G/RECUADRO-NOTICIA-CNN.png"
+
+
+def has_class(class_name: str) -> str:
+    """
+    Return an XPath predicate matching elements with the given CSS class.
+    """
+
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+# News page 1: listing with every article field.
+ARTICLES_XPATH = etree.XPath("//article")
+ARTICLE_CLASSES_XPATH = etree.XPath("string(@class)")
+ARTICLE_DATE_XPATH = etree.XPath(
+    f"string((.//*[{has_class('elementor-post-date')}])[1])"
+)
+ARTICLE_URL_XPATH = etree.XPath(
+    f"string((.//*[{has_class('elementor-post__thumbnail__link')}])[1]/@href)"
+)
+ARTICLE_TITLE_XPATH = etree.XPath("string((.//h3)[1])")
+ARTICLE_IMAGE_XPATH = etree.XPath("string((.//img)[1]/@src)")
+ARTICLE_BODY_XPATH = etree.XPath("string((.//p)[1])")
+
+# News page 2: listing with links to the detail pages holding the fields.
+LISTING_ID_XPATH = etree.XPath("concat(@id, ' ', @class)")
+LISTING_URL_XPATH = etree.XPath("string((.//a)[1]/@href)")
+DETAIL_ID_XPATH = etree.XPath("string(//body/@class)")
+DETAIL_DATE_XPATH = etree.XPath(f"string((//span[{has_class('fecha')}])[1])")
+DETAIL_TITLE_XPATH = etree.XPath("string((//h1)[1])")
+DETAIL_IMAGE_XPATH = etree.XPath(
+    f"string((//img[{has_class('attachment-post-thumbnail')}])[1]/@data-src)"
+)
+DETAIL_BODY_XPATH = etree.XPath("string((//*[@id='dslc-theme-content-inner']//p)[1])")
+
+# News page 3: listing with a title element followed by a body element.
+PREVIEWS_XPATH = etree.XPath(f"//*[{has_class('titulopreviewnoticia')}]")
+PREVIEW_TITLE_XPATH = etree.XPath("string(.)")
+PREVIEW_BODY_XPATH = etree.XPath("following-sibling::*[1]")
+PREVIEW_URL_XPATH = etree.XPath(
+    f"string((.//*[{has_class('linkpreviewnoticia')}]//a)[1]/@href)"
+)
+PREVIEW_DESCRIPTION_XPATH = etree.XPath(
+    f"string((.//*[{has_class('descripcionpreviewnoticia')}]//p)[1])"
+)
+
+
+@dataclass
+class ParsedArticle:
+    """
+    Store the fields of an article found in a news page, matching the ones of
+    :model:`scraper.Article`.
+    """
+
+    id_number: str | None
+    url: str
+    title: str = ""
+    post_date: date | None = None
+    image: str = ""
+    body: str = ""
+
+
+def parse_document(document: str) -> html.HtmlElement | None:
+    """
+    Return the root element of the given HTML document, or None if empty.
+    """
+
+    if not document.strip():
+        return None
+    return html.document_fromstring(document)
+
+
+def get_prefixed_id(classes: str, prefix: str) -> str | None:
+    """
+    Return the numeric suffix of the first class starting with the prefix.
+    """
+
+    for class_name in classes.split():
+        if class_name.startswith(prefix) and class_name[len(prefix) :].isdigit():
+            return class_name[len(prefix) :]
+    return None
+
+
+def iter_listing(
+    news_page: NewsPage, root: html.HtmlElement
+) -> Iterator[ParsedArticle]:
+    """
+    Lazily parse the listing of the given :model:`scraper.NewsPage`, yielding
+    its articles in listing order. Articles of news pages with detail pages only
+    hold their URL and, when the listing exposes it, their ID number.
+    """
+
+    if news_page.id == 1:
+        for article in ARTICLES_XPATH(root):
+            yield ParsedArticle(
+                id_number=get_prefixed_id(ARTICLE_CLASSES_XPATH(article), "post-"),
+                url=ARTICLE_URL_XPATH(article),
+                title=ARTICLE_TITLE_XPATH(article).strip(),
+                post_date=datetime.strptime(
+                    ARTICLE_DATE_XPATH(article).strip(), "%d/%m/%Y"
+                ).date(),
+                image=ARTICLE_IMAGE_XPATH(article),
+                body=ARTICLE_BODY_XPATH(article).strip(),
+            )
+
+    elif news_page.id == 2:
+        for article in ARTICLES_XPATH(root):
+            yield ParsedArticle(
+                id_number=get_prefixed_id(LISTING_ID_XPATH(article), "post-"),
+                url=LISTING_URL_XPATH(article),
+            )
+
+    elif news_page.id == 3:
+        for article in PREVIEWS_XPATH(root):
+            title: str = PREVIEW_TITLE_XPATH(article)
+            body_tag = PREVIEW_BODY_XPATH(article)[0]
+            href: str = PREVIEW_URL_XPATH(body_tag)
+            yield ParsedArticle(
+                id_number=href.split("=")[-1],
+                url=news_page.url[:34] + href,
+                title=title[13:],
+                post_date=datetime.strptime(title[:10], "%d/%m/%Y").date(),
+                image=CNN_IMAGE_URL,
+                body=PREVIEW_DESCRIPTION_XPATH(body_tag),
+            )
+
+
+def is_past(news_page: NewsPage, article: ParsedArticle, since: date | None) -> bool:
+    """
+    Return True if the article is older than the given date and the
+    :model:`scraper.NewsPage` lists its articles newest first, so every
+    following article can be skipped.
+    """
+
+    return (
+        since is not None
+        and news_page.is_newest_first
+        and article.post_date is not None
+        and article.post_date < since
+    )
+
+
+def parse_listing(
+    news_page: NewsPage, document: str, since: date | None = None
+) -> list[ParsedArticle]:
+    """
+    Parse the listing of the given :model:`scraper.NewsPage` and return its
+    articles, stopping at the first one older than since if given.
+    """
+
+    root = parse_document(document)
+    if root is None:
+        return []
+
+    parsed_articles_list: list[ParsedArticle] = []
+    for article in iter_listing(news_page, root):
+        if is_past(news_page, article, since):
+            break
+        parsed_articles_list.append(article)
+    return parsed_articles_list
+
+
+def parse_detail(news_page: NewsPage, url: str, document: str) -> ParsedArticle | None:
+    """
+    Parse an article detail page of the given :model:`scraper.NewsPage`, or
+    return None if it is empty.
+    """
+
+    root = parse_document(document)
+    if root is None:
+        return None
+
+    if news_page.id == 2:
+        return ParsedArticle(
+            id_number=get_prefixed_id(DETAIL_ID_XPATH(root), "postid-"),
+            url=url,
+            title=DETAIL_TITLE_XPATH(root),
+            post_date=datetime.strptime(
+                DETAIL_DATE_XPATH(root).strip(), "%d de %B, %Y"
+            ).date(),
+            image=DETAIL_IMAGE_XPATH(root),
+            body=DETAIL_BODY_XPATH(root),
+        )
+    raise ValueError(f"{news_page} has no article detail pages.")
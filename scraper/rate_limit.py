@@ -0,0 +1,226 @@
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from scraper.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Graph API response headers reporting the percentage of the budget used.
+USAGE_HEADERS: tuple = (
+    "X-App-Usage",
+    "X-Page-Usage",
+    "X-Business-Use-Case-Usage",
+)
+USAGE_METRICS: tuple = ("call_count", "total_cputime", "total_time")
+
+# Lowest fraction of the configured rate kept while the usage is high.
+MIN_RATE_FACTOR: float = 0.05
+# Seconds to stop calling a target that used its whole budget when the
+# headers don't say when access is regained.
+DEFAULT_BLOCK_SECONDS: int = 60
+BUCKET_EXPIRE_SECONDS: int = 3600
+
+# Refill the bucket of KEYS[1] and take ARGV[3] tokens from it if there is at
+# least one left, letting it go into debt. Return the seconds to wait for the
+# next token as a string, since Redis truncates Lua numbers to integers.
+ACQUIRE_SCRIPT: str = """
+local now = redis.call("TIME")
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated", "rate", "blocked_until")
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(bucket[3]) or tonumber(ARGV[1])
+local blocked_until = tonumber(bucket[4]) or 0
+if now < blocked_until then
+    return tostring(blocked_until - now)
+end
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+else
+    tokens = tokens - tonumber(ARGV[3])
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated", tostring(now))
+redis.call("EXPIRE", KEYS[1], ARGV[4])
+return tostring(wait)
+"""
+
+# Set the rate of KEYS[1] to ARGV[1] tokens per second and block it until
+# ARGV[2] seconds from now, if given.
+UPDATE_SCRIPT: str = """
+local now = redis.call("TIME")
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+redis.call("HSET", KEYS[1], "rate", ARGV[1])
+if tonumber(ARGV[2]) > 0 then
+    redis.call("HSET", KEYS[1], "blocked_until", tostring(now + tonumber(ARGV[2])))
+end
+redis.call("EXPIRE", KEYS[1], ARGV[3])
+return 1
+"""
+
+_local_buckets: dict[str, dict] = {}
+_local_lock = threading.Lock()
+
+
+def get_bucket_key(target: str) -> str:
+    """
+    Return the Redis key of the rate limit bucket of the given target.
+    """
+
+    return f"ezalor:rate_limit:{target}"
+
+
+def get_default_rate() -> float:
+    """
+    Return the configured tokens per second of every target.
+    """
+
+    return settings.GRAPH_API_CALLS_PER_MINUTE / 60
+
+
+def acquire(target: str, cost: int = 1) -> float:
+    """
+    Take cost tokens from the bucket of the given Facebook page or Instagram
+    profile ID. Return 0 if the calls can be sent now, or the seconds to wait
+    before trying again otherwise.
+    """
+
+    client = get_redis()
+    if client is not None:
+        try:
+            return float(
+                client.eval(
+                    ACQUIRE_SCRIPT,
+                    1,
+                    get_bucket_key(target),
+                    get_default_rate(),
+                    settings.GRAPH_API_BURST,
+                    cost,
+                    BUCKET_EXPIRE_SECONDS,
+                )
+            )
+        except RedisError as exc:
+            logger.warning(f"Rate limiter unavailable, using local buckets: {exc}")
+
+    now: float = time.monotonic()
+    with _local_lock:
+        bucket: dict = _local_buckets.setdefault(
+            target, {"tokens": settings.GRAPH_API_BURST, "updated": now}
+        )
+        rate: float = bucket.get("rate", get_default_rate())
+        if now < bucket.get("blocked_until", 0):
+            return bucket["blocked_until"] - now
+        tokens: float = min(
+            settings.GRAPH_API_BURST,
+            bucket["tokens"] + (now - bucket["updated"]) * rate,
+        )
+        wait: float = 0.0
+        if tokens < 1:
+            wait = (1 - tokens) / rate
+        else:
+            tokens -= cost
+        bucket.update(tokens=tokens, updated=now)
+        return wait
+
+
+def get_usage(headers) -> tuple[int | None, int]:
+    """
+    Return the highest percentage of the budget used reported by the given
+    Graph API response headers, or None if they report none, and the seconds
+    until access is regained.
+    """
+
+    usage: int | None = None
+    regain_seconds: int = 0
+    for name in USAGE_HEADERS:
+        if not headers.get(name):
+            continue
+        try:
+            value = json.loads(headers[name])
+        except ValueError:
+            continue
+        if not isinstance(value, dict):
+            continue
+        if name == "X-Business-Use-Case-Usage":
+            usages_list: list[dict] = [
+                usage_dict
+                for usages in value.values()
+                if isinstance(usages, list)
+                for usage_dict in usages
+                if isinstance(usage_dict, dict)
+            ]
+        else:
+            usages_list = [value]
+        for usage_dict in usages_list:
+            usage = max(
+                usage or 0,
+                *(int(usage_dict.get(metric) or 0) for metric in USAGE_METRICS),
+            )
+            regain_seconds = max(
+                regain_seconds,
+                int(usage_dict.get("estimated_time_to_regain_access") or 0) * 60,
+            )
+    return usage, regain_seconds
+
+
+def update_rate(target: str, headers) -> None:
+    """
+    Slow down the bucket of the given target as the usage reported by the
+    Graph API response headers grows, and stop it once the budget is used up.
+    Responses without usage headers leave the bucket as it is.
+    """
+
+    usage, regain_seconds = get_usage(headers)
+    if usage is None:
+        return
+    rate: float = get_default_rate() * max(MIN_RATE_FACTOR, 1 - usage / 100)
+    if usage >= 100:
+        regain_seconds = regain_seconds or DEFAULT_BLOCK_SECONDS
+    set_bucket(target, rate, regain_seconds)
+
+
+def block(target: str, seconds: int = DEFAULT_BLOCK_SECONDS) -> None:
+    """
+    Stop the bucket of the given target for the given seconds, after the
+    Graph API answered it is over its rate limit.
+    """
+
+    set_bucket(target, get_default_rate() * MIN_RATE_FACTOR, seconds)
+
+
+def set_bucket(target: str, rate: float, block_seconds: int = 0) -> None:
+    """
+    Set the refill rate of the bucket of the given target, and stop it for the
+    given seconds if any.
+    """
+
+    client = get_redis()
+    if client is not None:
+        try:
+            client.eval(
+                UPDATE_SCRIPT,
+                1,
+                get_bucket_key(target),
+                rate,
+                block_seconds,
+                BUCKET_EXPIRE_SECONDS,
+            )
+            return
+        except RedisError as exc:
+            logger.warning(f"Rate limiter unavailable, using local buckets: {exc}")
+
+    now: float = time.monotonic()
+    with _local_lock:
+        bucket: dict = _local_buckets.setdefault(
+            target, {"tokens": settings.GRAPH_API_BURST, "updated": now}
+        )
+        bucket["rate"] = rate
+        if block_seconds:
+            bucket["blocked_until"] = now + block_seconds
@@ -0,0 +1,33 @@
+import os
+import threading
+
+from django.conf import settings
+from redis import Redis
+
+_client: Redis | None = None
+_client_pid: int | None = None
+_client_lock = threading.Lock()
+
+REDIS_SCHEMES: tuple = ("redis://", "rediss://", "unix://")
+
+
+def get_redis() -> Redis | None:
+    """
+    Return the Redis client of the current process, creating it if needed,
+    or None if settings.REDIS_URL doesn't point to a Redis server. Clients are
+    never shared with forked processes.
+    """
+
+    global _client, _client_pid
+
+    if not settings.REDIS_URL.startswith(REDIS_SCHEMES):
+        return None
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.REDIS_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_TIMEOUT,
+            )
+            _client_pid = os.getpid()
+        return _client
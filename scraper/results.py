@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django_celery_results.models import TaskResult
+
+from scraper.models import TaskResultDailySummary
+
+logger = logging.getLogger(__name__)
+
+
+def add_daily_summaries(task_result_ids_list: list[int]) -> None:
+    """
+    Add the given Celery task results to the
+    :model:`scraper.TaskResultDailySummary` instances of their day, task and
+    state, creating those missing.
+    """
+
+    rows = (
+        TaskResult.objects.filter(id__in=task_result_ids_list)
+        .annotate(day=TruncDate("date_done"))
+        .values("day", "task_name", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        task_name: str = row["task_name"] or ""
+        updated: int = TaskResultDailySummary.objects.filter(
+            day=row["day"], task_name=task_name, status=row["status"]
+        ).update(count=F("count") + row["total"])
+        if not updated:
+            TaskResultDailySummary.objects.create(
+                day=row["day"],
+                task_name=task_name,
+                status=row["status"],
+                count=row["total"],
+            )
+
+
+def compact_task_results(before: datetime) -> int:
+    """
+    Roll the Celery task results finished before the given moment up into
+    daily summaries and delete them, one batch per transaction so the table
+    is never locked for long. Return the number of deleted task results.
+    """
+
+    total_deleted: int = 0
+    while True:
+        with transaction.atomic():
+            task_result_ids_list: list[int] = list(
+                TaskResult.objects.select_for_update(skip_locked=True)
+                .filter(date_done__lt=before)
+                .order_by("id")
+                .values_list("id", flat=True)[
+                    : settings.TASK_RESULT_COMPACTION_BATCH_SIZE
+                ]
+            )
+            if not task_result_ids_list:
+                return total_deleted
+            add_daily_summaries(task_result_ids_list)
+            TaskResult.objects.filter(id__in=task_result_ids_list).delete()
+        total_deleted += len(task_result_ids_list)
+        logger.debug(f"Compacted {total_deleted} task results.")
@@ -0,0 +1,91 @@
+import re
+from datetime import datetime
+
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+# Text search configuration created by the 0008_article_search migration.
+SEARCH_CONFIG: str = "ezalor_spanish"
+# FTS5 table created by the same migration on SQLite, and the weights of the
+# title and body columns when ranking its matches.
+FTS_TABLE: str = "scraper_article_fts"
+FTS_WEIGHTS: tuple = (10.0, 1.0)
+DATE_FORMATS: tuple = ("%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d")
+
+
+def parse_date(search_term: str) -> datetime | None:
+    """
+    Return the date of the given search term in any of the accepted formats, or
+    None if it isn't one.
+    """
+
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(search_term.strip(), date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def get_fts_query(search_term: str) -> str:
+    """
+    Return the FTS5 query matching every word of the given search term as a
+    prefix, which stands in for stemming. Words are quoted so the search term
+    can't use the FTS5 query syntax.
+    """
+
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", search_term))
+
+
+def search_articles(queryset: QuerySet, search_term: str) -> QuerySet:
+    """
+    Filter the given :model:`scraper.Article` queryset by the search term,
+    annotating the relevance of each article as search_rank. A date search
+    term matches the articles posted on that day.
+    """
+
+    search_date: datetime | None = parse_date(search_term)
+    if search_date is not None:
+        return queryset.filter(post_date=search_date.date()).annotate(
+            search_rank=Value(1.0, output_field=FloatField())
+        )
+
+    if connection.vendor == "postgresql":
+        search_query = SearchQuery(
+            search_term, config=SEARCH_CONFIG, search_type="websearch"
+        )
+        return queryset.filter(
+            Q(search_vector=search_query)
+            | Q(TrigramSimilar(F("title"), Value(search_term)))
+        ).annotate(
+            search_rank=SearchRank(F("search_vector"), search_query)
+            + TrigramSimilarity("title", search_term)
+        )
+
+    if connection.vendor == "sqlite":
+        fts_query: str = get_fts_query(search_term)
+        if not fts_query:
+            return queryset.none().annotate(
+                search_rank=Value(0.0, output_field=FloatField())
+            )
+        table: str = queryset.model._meta.db_table
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                (fts_query,),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}, %s, %s) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+                (*FTS_WEIGHTS, fts_query),
+                output_field=FloatField(),
+            )
+        )
+
+    return queryset.filter(
+        Q(title__icontains=search_term) | Q(body__icontains=search_term)
+    ).annotate(search_rank=Value(1.0, output_field=FloatField()))
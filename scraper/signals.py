@@ -1,7 +1,19 @@
-from django.db.models.signals import post_delete
+import time
+
+from celery.signals import task_postrun, task_prerun, task_retry
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from scraper.models import Article, FacebookPost, InstagramPost
+from scraper import metrics
+from scraper.cache import clear_publishing_targets
+from scraper.models import (
+    Article,
+    FacebookPage,
+    FacebookPost,
+    InstagramPost,
+    InstagramProfile,
+    PostStatus,
+)
 
 
 @receiver(post_delete, sender=FacebookPost, weak=False)
@@ -16,7 +28,7 @@ def delete_facebook_post_signal(sender, instance, **kwargs):
     # Facebook does not yet support delete via their API. Please see the content publishing API.
 
     article: Article = instance.article
-    if not article.facebook_posts.exists():
+    if not article.facebook_posts.filter(status=PostStatus.PUBLISHED).exists():
         article.is_facebook = False
         article.save()
 
@@ -31,6 +43,58 @@ def delete_instagram_post_signal(sender, instance, **kwargs):
     # Instagram does not yet support delete via their API. Please see the content publishing API.
 
     article: Article = instance.article
-    if not article.instagram_posts.exists():
+    if not article.instagram_posts.filter(status=PostStatus.PUBLISHED).exists():
         article.is_instagram = False
         article.save()
+
+
+@receiver(post_save, sender=FacebookPage, weak=False)
+@receiver(post_delete, sender=FacebookPage, weak=False)
+@receiver(post_save, sender=InstagramProfile, weak=False)
+@receiver(post_delete, sender=InstagramProfile, weak=False)
+def publishing_target_signal(sender, instance, **kwargs):
+    """
+    Clear the cached publishing targets after a :model:`scraper.FacebookPage`
+    or :model:`scraper.InstagramProfile` instance is saved or deleted.
+    """
+
+    clear_publishing_targets()
+
+
+# Start time of the tasks running in the current process.
+_task_started: dict[str, float] = {}
+
+
+@task_prerun.connect(weak=False)
+def task_started_signal(task_id, task, **kwargs):
+    """
+    Store the time a Celery task started, to measure how long it runs.
+    """
+
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect(weak=False)
+def task_finished_signal(task_id, task, state=None, **kwargs):
+    """
+    Add the time a Celery task ran to the histogram of its name and final
+    state.
+    """
+
+    started: float | None = _task_started.pop(task_id, None)
+    if started is None:
+        return
+    metrics.observe(
+        "ezalor_task_seconds",
+        {"task": task.name, "state": state or "UNKNOWN"},
+        time.perf_counter() - started,
+    )
+
+
+@task_retry.connect(weak=False)
+def task_retried_signal(sender, **kwargs):
+    """
+    Count the retries of a Celery task by its name.
+    """
+
+    metrics.inc("ezalor_task_retries_total", {"task": sender.name})
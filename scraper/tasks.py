@@ -1,27 +1,60 @@
 import json
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlencode
+from uuid import uuid4
 
-import requests
-from celery import Task, shared_task, states
-from celery.exceptions import Ignore
+from celery import Task, chord, current_app, group, shared_task, states
+from celery.exceptions import Ignore, Retry, SoftTimeLimitExceeded
 from celery.utils.log import get_task_logger
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
 from django.utils import timezone
+from requests import RequestException
 
-from scraper.custom_pickle import fetch_new_articles
+from scraper import graph_api, metrics, rate_limit
+from scraper.backfill import backfill_page_range
+from scraper.custom_pickle import fetch_news_page_articles
+from scraper.duplicates import delete_old_fingerprint_bands
+from scraper.graph_api import (
+    MEDIA_NOT_READY_CODE,
+    GraphAPIError,
+    PermanentGraphAPIError,
+    RateLimitedGraphAPIError,
+    TokenGraphAPIError,
+    TransientGraphAPIError,
+)
+from scraper.http_client import get_session
+from scraper.images import get_image_url, prepare_article_images
+from scraper.instrumentation import recording
 from scraper.models import (
     Article,
+    BackfillCheckpoint,
     FacebookPage,
     FacebookPost,
     InstagramPost,
     InstagramProfile,
+    NewsPage,
+    PostStatus,
 )
+from scraper.results import compact_task_results
 
 logger = get_task_logger(__name__)
 
+# Maximum number of requests the Graph API accepts in a single batch.
+GRAPH_API_BATCH_SIZE: int = 50
+
 
 class BaseTaskWithRetry(Task):
-    autoretry_for = (Exception, KeyError)
+    autoretry_for = (TransientGraphAPIError, RequestException)
     retry_kwargs = {"max_retries": 3}
     retry_backoff = 10
+    retry_backoff_max = 600
+    retry_jitter = True
 
 
 def get_post_caption(article) -> str:
@@ -35,62 +68,577 @@ def get_post_caption(article) -> str:
     )
 
 
-@shared_task(bind=True)
-def fetch_new_articles_task(self) -> None:
+def reserve_budget(task: Task, target: str, cost: int = 1) -> None:
     """
-    Search all :model:`scraper.NewsPage` instances for new articles.
+    Take cost calls from the rate limit budget of the given Facebook page or
+    Instagram profile ID. Without budget left the running task is rescheduled
+    for when there is, instead of holding the worker while it waits.
     """
 
-    total_created: int = fetch_new_articles()
-    self.update_state(
-        state=states.SUCCESS, meta=f"Successfully created {total_created} articles."
+    wait: float = rate_limit.acquire(target, cost)
+    while wait and task.request.is_eager:
+        time.sleep(wait)
+        wait = rate_limit.acquire(target, cost)
+    if not wait:
+        return
+
+    countdown: float = wait * (1 + random.random())
+    logger.info(
+        f"Rate limit budget of {target} used up, retrying in {countdown:.1f} s."
     )
-    logger.info(f"Successfully created {total_created} articles.")
+    task.apply_async(
+        args=task.request.args,
+        kwargs=task.request.kwargs,
+        task_id=task.request.id,
+        retries=task.request.retries,
+        countdown=countdown,
+    )
+    raise Ignore()
 
 
-@shared_task(bind=True, base=BaseTaskWithRetry)
-def create_facebook_post_task(self, article_id: int, facebook_page_id: int) -> None:
+def get_target_id(target: FacebookPage | InstagramProfile) -> str:
     """
-    Create a Facebook post for selected :model:`scraper.Article` instance.
+    Return the Graph API ID of the given :model:`scraper.FacebookPage` or
+    :model:`scraper.InstagramProfile`.
     """
 
-    facebook_page = FacebookPage.objects.get(pk=facebook_page_id)
-    article = Article.objects.get(pk=article_id)
+    if isinstance(target, FacebookPage):
+        return target.page_id
+    return target.user_id
 
-    if article.is_facebook:
-        self.update_state(
+
+def fail_permanently(
+    task: Task,
+    target: FacebookPage | InstagramProfile,
+    error: GraphAPIError,
+    posts_list: list[FacebookPost | InstagramPost],
+) -> None:
+    """
+    Fail the running task and its posts without retries. If the token of the
+    given page or profile is broken, publishing to it stops instead and the
+    posts wait for the token to be changed.
+    """
+
+    if isinstance(error, TokenGraphAPIError):
+        target.set_broken(error.message)
+        logger.error(f"Publishing to {target} stopped, its token is broken.")
+        set_posts_status(posts_list, PostStatus.PENDING)
+    else:
+        set_posts_status(posts_list, PostStatus.FAILED, error.message)
+    task.update_state(state=states.FAILURE, meta=error.message)
+    logger.error(error.message)
+    raise Ignore()
+
+
+def set_posts_status(
+    posts_list: list[FacebookPost | InstagramPost], status: str, error: str = ""
+) -> None:
+    """
+    Save the given status and error in each of the given posts.
+    """
+
+    for post in posts_list:
+        post.status = status
+        post.error = error
+        post.save(update_fields=["status", "error"])
+
+
+def claim_posts(task: Task, posts: models.QuerySet) -> int:
+    """
+    Mark the given posts as being processed by the running task in a single
+    conditional update, so of several tasks trying to publish the same post
+    only one does. Posts published or processed by another task are left
+    out, unlike the ones only dispatched to a task. Return the number of
+    claimed posts.
+    """
+
+    return posts.filter(
+        Q(status__in=(PostStatus.PENDING, PostStatus.FAILED))
+        | Q(status=PostStatus.PROCESSING, task_id__in=("", task.request.id))
+    ).update(
+        status=PostStatus.PROCESSING,
+        task_id=task.request.id,
+        processing_started_at=timezone.now(),
+    )
+
+
+def claim_post(task: Task, post: FacebookPost | InstagramPost, network: str) -> None:
+    """
+    Claim the given post for the running task, or stop the task if the post
+    is already published or being published by another one.
+    """
+
+    if claim_posts(task, type(post).objects.filter(pk=post.pk)):
+        post.refresh_from_db(fields=["status", "task_id", "processing_started_at"])
+        return
+
+    post.refresh_from_db(fields=["status"])
+    if post.status == PostStatus.PUBLISHED:
+        message: str = f"Selected article already has a related {network} post."
+    else:
+        message = f"Selected article is already being posted to {network}."
+    task.update_state(state=states.FAILURE, meta=message)
+    logger.error(message)
+    raise Ignore()
+
+
+def call_graph_api(
+    task: Task,
+    target: FacebookPage | InstagramProfile,
+    method: str,
+    path: str,
+    cost: int = 1,
+    posts_list: list[FacebookPost | InstagramPost] | None = None,
+    **kwargs,
+) -> dict | list:
+    """
+    Send a request to the Graph API on behalf of the given page or profile,
+    within its rate limit budget, and return the decoded response. Transient
+    errors are raised to be retried, while permanent ones fail the task and
+    the given posts.
+    """
+
+    posts_list = posts_list or []
+    if target.broken_at:
+        set_posts_status(posts_list, PostStatus.PENDING)
+        task.update_state(
             state=states.FAILURE,
-            meta="Selected article already has a related Facebook post.",
+            meta=f"Publishing to {target} stopped, its token is broken.",
         )
-        logger.error("Selected article already has a related Facebook post.")
+        logger.error(f"Publishing to {target} stopped, its token is broken.")
         raise Ignore()
+
+    target_id: str = get_target_id(target)
+    reserve_budget(task, target_id, cost)
+    started: float = time.perf_counter()
+    request = get_session().request(
+        method, f"{settings.GRAPH_API_URL}/{path}", **kwargs
+    )
+    metrics.observe(
+        "ezalor_graph_api_request_seconds",
+        {"target": str(target), "method": method},
+        time.perf_counter() - started,
+    )
+    rate_limit.update_rate(target_id, request.headers)
+    try:
+        return graph_api.get_response(request)
+    except RateLimitedGraphAPIError:
+        metrics.inc(
+            "ezalor_graph_api_errors_total",
+            {"target": str(target), "kind": "rate_limited"},
+        )
+        rate_limit.block(target_id)
+        return call_graph_api(task, target, method, path, cost, posts_list, **kwargs)
+    except TransientGraphAPIError:
+        metrics.inc(
+            "ezalor_graph_api_errors_total",
+            {"target": str(target), "kind": "transient"},
+        )
+        raise
+    except PermanentGraphAPIError as error:
+        metrics.inc(
+            "ezalor_graph_api_errors_total",
+            {"target": str(target), "kind": "permanent"},
+        )
+        fail_permanently(task, target, error, posts_list)
+
+
+def facebook_post_failed(task, exc, task_id, args, kwargs, einfo) -> None:
+    """
+    Mark the Facebook posts of a task that ran out of retries as failed.
+    """
+
+    article_ids_list: list[int] = args[0] if isinstance(args[0], list) else [args[0]]
+    FacebookPost.objects.filter(
+        article_id__in=article_ids_list, page_id=args[1]
+    ).exclude(status=PostStatus.PUBLISHED).update(
+        status=PostStatus.FAILED, error=str(exc)
+    )
+
+
+def instagram_post_failed(task, exc, task_id, args, kwargs, einfo) -> None:
+    """
+    Mark the Instagram post of a task that ran out of retries as failed.
+    """
+
+    if task.name == publish_instagram_post_task.name:
+        instagram_posts = InstagramPost.objects.filter(pk=args[0])
     else:
-        request = requests.post(
-            url=f"https://graph.facebook.com/{facebook_page.page_id}/photos",
-            params={
-                "caption": get_post_caption(article),
-                "access_token": facebook_page.page_token,
-                "url": article.image,
-            },
+        instagram_posts = InstagramPost.objects.filter(
+            article_id=args[0], profile_id=args[1]
         )
-        response_dict: dict = json.loads(request.text)
+    instagram_posts.exclude(status=PostStatus.PUBLISHED).update(
+        status=PostStatus.FAILED, error=str(exc)
+    )
 
-        if "error" in response_dict.keys():
-            raise Exception(response_dict.get("error").get("message"))
-        else:
-            FacebookPost.objects.create(
-                article=article,
-                page=facebook_page,
-                post_date=timezone.now(),
-                post_id=response_dict.get("post_id"),
+
+def get_chunks(items_list: list, size: int) -> list[list]:
+    """
+    Return the given list split in lists of up to size items.
+    """
+
+    return [
+        items_list[start : start + size] for start in range(0, len(items_list), size)
+    ]
+
+
+def get_chunk_signatures(
+    task: Task, article_ids_list: list[int], target_id: int
+) -> list:
+    """
+    Return the signatures posting the given articles to a single Facebook page
+    or Instagram profile, split in chunks of settings.PUBLISHING_CHUNK_SIZE.
+    """
+
+    return [
+        create_posts_chunk_task.s(
+            task.name, [(article_id, target_id) for article_id in article_ids_chunk]
+        )
+        for article_ids_chunk in get_chunks(
+            article_ids_list, settings.PUBLISHING_CHUNK_SIZE
+        )
+    ]
+
+
+def observe_scrape(
+    news_page: NewsPage, seconds: float, timings: dict[str, float]
+) -> None:
+    """
+    Add the time spent scraping the given :model:`scraper.NewsPage` and on
+    each of its phases to their histograms.
+    """
+
+    metrics.observe("ezalor_scrape_seconds", {"news_page": news_page.name}, seconds)
+    for name, phase_seconds in timings.items():
+        metrics.observe(
+            "ezalor_scrape_phase_seconds",
+            {"news_page": news_page.name, "phase": name},
+            phase_seconds,
+        )
+
+
+@shared_task(ignore_result=True)
+def fetch_new_articles_task() -> None:
+    """
+    Search all :model:`scraper.NewsPage` instances for new articles, running
+    one subtask per news page and aggregating their results.
+    """
+
+    news_page_ids_list: list[int] = list(NewsPage.objects.values_list("id", flat=True))
+    chord(
+        fetch_news_page_articles_task.s(news_page_id)
+        for news_page_id in news_page_ids_list
+    )(aggregate_new_articles_task.s())
+
+
+@shared_task(
+    bind=True,
+    max_retries=settings.SCRAPER_TASK_MAX_RETRIES,
+    soft_time_limit=settings.SCRAPER_TASK_TIME_LIMIT,
+    time_limit=settings.SCRAPER_TASK_TIME_LIMIT + 30,
+)
+def fetch_news_page_articles_task(self, news_page_id: int) -> int:
+    """
+    Search a single :model:`scraper.NewsPage` instance for new articles.
+    Return the number of created articles, or 0 if the news page could not be
+    scraped, so one broken news page does not discard the others' results.
+    """
+
+    news_page = NewsPage.objects.get(pk=news_page_id)
+    try:
+        with recording() as timings:
+            started: float = time.perf_counter()
+            total_created: int = fetch_news_page_articles(news_page)
+        observe_scrape(news_page, time.perf_counter() - started, timings)
+        metrics.inc(
+            "ezalor_scrape_articles_total", {"news_page": news_page.name}, total_created
+        )
+        return total_created
+    except (RequestException, SoftTimeLimitExceeded) as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=10 * 2**self.request.retries)
+        logger.error(f"Could not fetch {news_page} articles: {exc}")
+    except Exception:
+        logger.exception(f"Could not parse {news_page} articles.")
+    metrics.inc("ezalor_scrape_failures_total", {"news_page": news_page.name})
+    return 0
+
+
+@shared_task(
+    bind=True, ignore_result=True, max_retries=settings.SCRAPER_TASK_MAX_RETRIES
+)
+def backfill_articles_task(self, backfill_checkpoint_id: int) -> None:
+    """
+    Create the missing articles of the listing pages of a
+    :model:`scraper.BackfillCheckpoint` instance, resuming from the page it
+    stopped at.
+    """
+
+    checkpoint = BackfillCheckpoint.objects.select_related("news_page").get(
+        pk=backfill_checkpoint_id
+    )
+    try:
+        total_created: int = backfill_page_range(checkpoint)
+    except RequestException as exc:
+        raise self.retry(exc=exc, countdown=10 * 2**self.request.retries)
+    logger.info(
+        f"Backfilled {total_created} articles of {checkpoint.news_page} from pages "
+        f"{checkpoint.first_page} to {checkpoint.last_page}."
+    )
+
+
+@shared_task
+def aggregate_new_articles_task(created_list: list[int]) -> str:
+    """
+    Add up the articles created by every :model:`scraper.NewsPage` subtask,
+    delete the fingerprint bands no new article is compared with anymore and
+    prepare the images of the new articles.
+    """
+
+    total_created: int = sum(created_list)
+    delete_old_fingerprint_bands(timezone.now().date())
+    prepare_article_images_task.delay()
+    logger.info(f"Successfully created {total_created} articles.")
+    return f"Successfully created {total_created} articles."
+
+
+@shared_task
+def prepare_article_images_task() -> str:
+    """
+    Download and resize the images of today's :model:`scraper.Article`
+    instances that have none yet, before they are published. Skipped without
+    a site URL, as the images could not be linked in posts.
+    """
+
+    if not settings.SITE_URL:
+        return "Skipped preparing images, SITE_URL is not set."
+
+    articles_list: list[Article] = list(
+        Article.objects.filter(
+            post_date=timezone.now().date(), image_asset__isnull=True
+        ).only("id", "image")
+    )
+    total_linked: int = prepare_article_images(articles_list)
+    logger.info(f"Prepared the images of {total_linked} articles.")
+    return f"Prepared the images of {total_linked} articles."
+
+
+@shared_task(
+    bind=True,
+    base=BaseTaskWithRetry,
+    ignore_result=True,
+    on_failure=facebook_post_failed,
+)
+def create_facebook_post_task(self, article_id: int, facebook_page_id: int) -> None:
+    """
+    Create a Facebook post for selected :model:`scraper.Article` instance.
+    """
+
+    facebook_page = FacebookPage.objects.get(pk=facebook_page_id)
+    article = Article.objects.select_related("news_page", "image_asset").get(
+        pk=article_id
+    )
+    facebook_post, _ = FacebookPost.objects.get_or_create(
+        article=article, page=facebook_page
+    )
+    claim_post(self, facebook_post, "Facebook")
+
+    response_dict: dict = call_graph_api(
+        self,
+        facebook_page,
+        "POST",
+        f"{facebook_page.page_id}/photos",
+        posts_list=[facebook_post],
+        params={
+            "caption": get_post_caption(article),
+            "access_token": facebook_page.page_token,
+            "url": get_image_url(article, "facebook_image"),
+        },
+    )
+    facebook_post.post_date = timezone.now()
+    facebook_post.post_id = response_dict.get("post_id")
+    facebook_post.status = PostStatus.PUBLISHED
+    facebook_post.save()
+    article.is_facebook = True
+    article.save()
+    metrics.inc("ezalor_posts_published_total", {"target": str(facebook_page)})
+    logger.info("Facebook post successfully created.")
+
+
+@shared_task(
+    bind=True,
+    base=BaseTaskWithRetry,
+    ignore_result=True,
+    on_failure=facebook_post_failed,
+)
+def create_facebook_posts_batch_task(
+    self, article_ids_list: list[int], facebook_page_id: int
+) -> None:
+    """
+    Create the Facebook posts of several :model:`scraper.Article` instances
+    in a single :model:`scraper.FacebookPage` with one Graph API batch request.
+    Articles whose post fails are retried individually.
+    """
+
+    facebook_page = FacebookPage.objects.get(pk=facebook_page_id)
+    FacebookPost.objects.bulk_create(
+        (
+            FacebookPost(article_id=article_id, page=facebook_page)
+            for article_id in article_ids_list
+        ),
+        ignore_conflicts=True,
+    )
+    facebook_posts = FacebookPost.objects.filter(
+        page=facebook_page, article_id__in=article_ids_list
+    )
+    claim_posts(self, facebook_posts)
+    facebook_posts_list: list[FacebookPost] = list(
+        facebook_posts.filter(status=PostStatus.PROCESSING, task_id=self.request.id)
+        .select_related("article__news_page", "article__image_asset")
+        .order_by("article_id")
+    )
+    if not facebook_posts_list:
+        return
+
+    response_list: list = call_graph_api(
+        self,
+        facebook_page,
+        "POST",
+        "",
+        len(facebook_posts_list),
+        facebook_posts_list,
+        data={
+            "access_token": facebook_page.page_token,
+            "include_headers": "false",
+            "batch": json.dumps(
+                [
+                    {
+                        "method": "POST",
+                        "relative_url": f"{facebook_page.page_id}/photos",
+                        "body": urlencode(
+                            {
+                                "caption": get_post_caption(facebook_post.article),
+                                "url": get_image_url(
+                                    facebook_post.article, "facebook_image"
+                                ),
+                            },
+                            doseq=True,
+                        ),
+                    }
+                    for facebook_post in facebook_posts_list
+                ]
+            ),
+        },
+    )
+
+    failed_article_ids_list: list[int] = []
+    for index, (facebook_post, response) in enumerate(
+        zip(facebook_posts_list, response_list)
+    ):
+        if not response:
+            failed_article_ids_list.append(facebook_post.article_id)
+            continue
+        response_dict: dict = json.loads(response["body"])
+        error: GraphAPIError | None = graph_api.get_error(
+            response_dict, response["code"]
+        )
+        if isinstance(error, TokenGraphAPIError):
+            facebook_page.set_broken(error.message)
+            logger.error(f"Publishing to {facebook_page} stopped, its token is broken.")
+            # Earlier transient failures are not retried against a broken
+            # page either, they wait with the rest until it is reset.
+            for pending_index, pending_post in enumerate(facebook_posts_list):
+                if (
+                    pending_index >= index
+                    or pending_post.article_id in failed_article_ids_list
+                ):
+                    pending_post.status = PostStatus.PENDING
+            failed_article_ids_list = []
+            break
+        elif isinstance(error, PermanentGraphAPIError):
+            logger.error(
+                f"Facebook post of article {facebook_post.article_id} failed: {error}"
             )
-            article.is_facebook = True
-            article.save()
-            logger.info("Facebook post successfully created.")
+            facebook_post.status = PostStatus.FAILED
+            facebook_post.error = error.message
+        elif error is not None or response["code"] != 200:
+            failed_article_ids_list.append(facebook_post.article_id)
+        else:
+            facebook_post.post_date = timezone.now()
+            facebook_post.post_id = response_dict.get("post_id")
+            facebook_post.status = PostStatus.PUBLISHED
+
+    # The posts retried individually are handed over to their own tasks.
+    for facebook_post in facebook_posts_list:
+        if facebook_post.article_id in failed_article_ids_list:
+            facebook_post.status = PostStatus.PROCESSING
+            facebook_post.task_id = ""
+    FacebookPost.objects.bulk_update(
+        facebook_posts_list, ["post_date", "post_id", "status", "error", "task_id"]
+    )
+    published_article_ids_list: list[int] = [
+        facebook_post.article_id
+        for facebook_post in facebook_posts_list
+        if facebook_post.status == PostStatus.PUBLISHED
+    ]
+    Article.objects.filter(pk__in=published_article_ids_list).update(is_facebook=True)
+    metrics.inc(
+        "ezalor_posts_published_total",
+        {"target": str(facebook_page)},
+        len(published_article_ids_list),
+    )
+    logger.info(
+        f"{len(published_article_ids_list)} Facebook posts successfully created."
+    )
+
+    # Backed off like the retries of this task, so a struggling page is not
+    # hit again at once.
+    for article_id in failed_article_ids_list:
+        create_facebook_post_task.apply_async(
+            args=(article_id, facebook_page.id),
+            countdown=get_exponential_backoff_interval(
+                factor=self.retry_backoff,
+                retries=self.request.retries,
+                maximum=self.retry_backoff_max,
+                full_jitter=self.retry_jitter,
+            ),
+        )
+
+
+@shared_task(bind=True, ignore_result=True)
+def create_posts_chunk_task(self, task_name: str, args_list: list[list[int]]) -> None:
+    """
+    Run the given post task once per arguments in this worker, as if each
+    run had been received on its own, so failed posts are retried or ignored
+    without stopping the rest of the chunk.
+    """
+
+    task: Task = current_app.tasks[task_name]
+    for args in args_list:
+        task.push_request(
+            id=str(uuid4()),
+            args=args,
+            kwargs={},
+            called_directly=False,
+            is_eager=self.request.is_eager,
+            delivery_info=self.request.delivery_info,
+        )
+        try:
+            task.run(*args)
+        except Ignore:
+            pass
+        except Retry as retry:
+            if retry.is_eager:
+                retry.sig.apply()
+        except Exception as exc:
+            logger.exception(f"{task_name}{tuple(args)} failed.")
+            task.on_failure(exc, task.request.id, args, {}, None)
+        finally:
+            task.pop_request()
 
 
-@shared_task(base=BaseTaskWithRetry)
-def delete_facebook_post_task(facebook_post_id: str, facebook_page_id) -> None:
+@shared_task(bind=True, base=BaseTaskWithRetry, ignore_result=True)
+def delete_facebook_post_task(self, facebook_post_id: str, facebook_page_id) -> None:
     """
     Delete a Facebook post given the :model:`scraper.FacebookPost` instance.
     Facebook does not yet support delete via their API. Please see the content publishing API.
@@ -98,83 +646,356 @@ def delete_facebook_post_task(facebook_post_id: str, facebook_page_id) -> None:
 
     facebook_page = FacebookPage.objects.get(pk=facebook_page_id)
 
-    request = requests.delete(
-        url=f"https://graph.facebook.com/{facebook_post_id}",
+    call_graph_api(
+        self,
+        facebook_page,
+        "DELETE",
+        facebook_post_id,
         params={"access_token": facebook_page.page_token},
     )
-    response_dict: dict = json.loads(request.text)
-    if "error" in response_dict.keys():
-        raise Exception(response_dict.get("error").get("message"))
-    else:
-        logger.info("Facebook post successfully deleted.")
+    logger.info("Facebook post successfully deleted.")
 
 
-@shared_task(bind=True, base=BaseTaskWithRetry)
+@shared_task(
+    bind=True,
+    base=BaseTaskWithRetry,
+    ignore_result=True,
+    on_failure=instagram_post_failed,
+)
 def create_instagram_post_task(
     self, article_id: int, instagram_profile_id: int
 ) -> None:
     """
-    Create an Instagram post for selected :model:`scraper.Article` instance.
+    Create the media container of an Instagram post for selected
+    :model:`scraper.Article` instance and schedule its publishing. A container
+    created before for the same profile is published instead of a new one.
     """
 
     instagram_profile = InstagramProfile.objects.get(pk=instagram_profile_id)
-    article = Article.objects.get(pk=article_id)
+    article = Article.objects.select_related("news_page", "image_asset").get(
+        pk=article_id
+    )
+    instagram_post, _ = InstagramPost.objects.get_or_create(
+        article=article, profile=instagram_profile
+    )
+    claim_post(self, instagram_post, "Instagram")
+
+    if not instagram_post.container_id:
+        container_response_dict: dict = call_graph_api(
+            self,
+            instagram_profile,
+            "POST",
+            f"{instagram_profile.user_id}/media",
+            posts_list=[instagram_post],
+            params={
+                "image_url": get_image_url(article, "instagram_image"),
+                "caption": f"{article.title}\n\n{article.body}\n\nCONTINUAR LEYENDO LA NOTA: {article.url}\n\nFUENTE: {article.news_page.url}\n\n👉 En twitter @CNNRadioVCP\n\n👉 Escuchanos en FM 106.9, en www.cnnradio.com.ar o descargá la App en app.cnnradio.com.ar\n\n#CNNRadioVCP #CNNRadioVillaCarlosPaz #CNNRadioCarlosPaz",
+                "access_token": instagram_profile.user_token,
+            },
+        )
+        instagram_post.container_id = container_response_dict.get("id")
+        instagram_post.save(update_fields=["container_id"])
+        logger.info("Instagram media container successfully created.")
+
+    schedule_instagram_publish(self, instagram_post.id)
+
+
+def schedule_instagram_publish(
+    task: Task, instagram_post_id: int, poll: int = 0
+) -> None:
+    """
+    Schedule the publishing of the given :model:`scraper.InstagramPost`
+    instance once its media container had time to be processed, handing the
+    post over from the running task to the publishing one.
+    """
 
-    if article.is_instagram:
+    publish_task_id: str = str(uuid4())
+    if not InstagramPost.objects.filter(
+        pk=instagram_post_id, task_id=task.request.id
+    ).update(task_id=publish_task_id):
+        logger.error("Instagram post is already being published by another task.")
+        return
+
+    countdown: int = settings.INSTAGRAM_CONTAINER_POLL_INTERVAL
+    if task.request.is_eager:
+        time.sleep(countdown)
+    publish_instagram_post_task.apply_async(
+        (instagram_post_id,),
+        {"poll": poll},
+        task_id=publish_task_id,
+        countdown=countdown,
+    )
+
+
+def set_instagram_post_published(
+    instagram_post: InstagramPost, post_id: str | None
+) -> None:
+    """
+    Store the given :model:`scraper.InstagramPost` instance as published with
+    the given media ID, if known.
+    """
+
+    instagram_post.post_date = timezone.now()
+    instagram_post.post_id = post_id
+    instagram_post.status = PostStatus.PUBLISHED
+    instagram_post.error = ""
+    instagram_post.save()
+    instagram_post.article.is_instagram = True
+    instagram_post.article.save()
+    metrics.inc("ezalor_posts_published_total", {"target": str(instagram_post.profile)})
+    logger.info("Instagram post successfully created.")
+
+
+@shared_task(
+    bind=True,
+    base=BaseTaskWithRetry,
+    ignore_result=True,
+    on_failure=instagram_post_failed,
+)
+def publish_instagram_post_task(self, instagram_post_id: int, poll: int = 0) -> None:
+    """
+    Publish the media container of the given :model:`scraper.InstagramPost`
+    instance if it finished processing, checking again later otherwise.
+    """
+
+    instagram_post = InstagramPost.objects.select_related("article", "profile").get(
+        pk=instagram_post_id
+    )
+    instagram_profile: InstagramProfile = instagram_post.profile
+    if instagram_post.status == PostStatus.PUBLISHED:
+        logger.info("Instagram post already published.")
+        return
+    claim_post(self, instagram_post, "Instagram")
+
+    status_response_dict: dict = call_graph_api(
+        self,
+        instagram_profile,
+        "GET",
+        instagram_post.container_id,
+        posts_list=[instagram_post],
+        params={
+            "fields": "status_code",
+            "access_token": instagram_profile.user_token,
+        },
+    )
+    status_code: str = status_response_dict.get("status_code")
+    if status_code == "PUBLISHED":
+        # An earlier run published the container but stopped before storing
+        # the post, so publishing it again would fail or post it twice.
+        logger.warning("Instagram media container was already published.")
+        set_instagram_post_published(instagram_post, None)
+        return
+    elif status_code == "IN_PROGRESS" and poll < settings.INSTAGRAM_CONTAINER_MAX_POLLS:
+        schedule_instagram_publish(self, instagram_post.id, poll + 1)
+        return
+    elif status_code != "FINISHED":
+        if status_code in ("ERROR", "EXPIRED", "IN_PROGRESS"):
+            # The container can't be published, so the next try creates
+            # another one. Unknown statuses keep it, as it may be published.
+            instagram_post.container_id = None
+            instagram_post.save(update_fields=["container_id"])
+        set_posts_status(
+            [instagram_post],
+            PostStatus.FAILED,
+            f"Instagram media container could not be published: {status_code}.",
+        )
         self.update_state(
             state=states.FAILURE,
-            meta="Selected article already has a related Instagram post.",
+            meta=f"Instagram media container could not be published: {status_code}.",
+        )
+        logger.error(
+            f"Instagram media container could not be published: {status_code}."
         )
-        logger.error("Selected article already has a related Instagram post.")
         raise Ignore()
-    else:
-        container_request = requests.post(
-            url=f"https://graph.facebook.com/{instagram_profile.user_id}/media",
+
+    try:
+        media_response_dict: dict = call_graph_api(
+            self,
+            instagram_profile,
+            "POST",
+            f"{instagram_profile.user_id}/media_publish",
+            posts_list=[instagram_post],
             params={
-                "image_url": article.image,
-                "caption": f"{article.title}\n\n{article.body}\n\nCONTINUAR LEYENDO LA NOTA: {article.url}\n\nFUENTE: {article.news_page.url}\n\n👉 En twitter @CNNRadioVCP\n\n👉 Escuchanos en FM 106.9, en www.cnnradio.com.ar o descargá la App en app.cnnradio.com.ar\n\n#CNNRadioVCP #CNNRadioVillaCarlosPaz #CNNRadioCarlosPaz",
+                "creation_id": instagram_post.container_id,
                 "access_token": instagram_profile.user_token,
             },
         )
-        container_response_dict: dict = json.loads(container_request.text)
+    except TransientGraphAPIError as error:
+        if error.code != MEDIA_NOT_READY_CODE:
+            raise
+        schedule_instagram_publish(self, instagram_post.id, poll + 1)
+        return
 
-        if "error" in container_response_dict.keys():
-            raise Exception(container_response_dict.get("error").get("message"))
-        else:
-            media_request = requests.post(
-                url=f"https://graph.facebook.com/{instagram_profile.user_id}/media_publish",
-                params={
-                    "creation_id": container_response_dict.get("id"),
-                    "access_token": instagram_profile.user_token,
-                },
+    set_instagram_post_published(instagram_post, media_response_dict.get("id"))
+
+
+def enqueue_posts(post_date: date) -> None:
+    """
+    Add a pending post of every :model:`scraper.Article` instance of the given
+    date to every working :model:`scraper.FacebookPage` and
+    :model:`scraper.InstagramProfile` it is not posted to yet, leaving out
+    near-duplicates of other articles.
+    """
+
+    article_ids_list: list[int] = list(
+        Article.objects.filter(
+            post_date=post_date, duplicate_of__isnull=True
+        ).values_list("id", flat=True)
+    )
+    if not article_ids_list:
+        return
+
+    FacebookPost.objects.bulk_create(
+        (
+            FacebookPost(article_id=article_id, page_id=facebook_page_id)
+            for facebook_page_id in FacebookPage.objects.filter(
+                broken_at__isnull=True
+            ).values_list("id", flat=True)
+            for article_id in article_ids_list
+        ),
+        ignore_conflicts=True,
+    )
+    InstagramPost.objects.bulk_create(
+        (
+            InstagramPost(article_id=article_id, profile_id=instagram_profile_id)
+            for instagram_profile_id in InstagramProfile.objects.filter(
+                broken_at__isnull=True
+            ).values_list("id", flat=True)
+            for article_id in article_ids_list
+        ),
+        ignore_conflicts=True,
+    )
+
+
+def get_oldest_post_date(today: date) -> date:
+    """
+    Return the post date of the oldest articles still published on the given
+    day.
+    """
+
+    return today - timedelta(days=settings.POST_MAX_AGE_DAYS)
+
+
+def take_pending_posts(
+    model: type[models.Model], target: str, today: date
+) -> dict[int, list[int]]:
+    """
+    Mark the pending posts of the given model in working targets, of articles
+    recent enough to be published, as being processed. Return their article
+    IDs by target ID.
+    """
+
+    pending_posts_list: list[tuple] = list(
+        model.objects.filter(
+            status=PostStatus.PENDING,
+            article__post_date__gte=get_oldest_post_date(today),
+            **{f"{target}__broken_at__isnull": True},
+        )
+        .order_by(target, "id")
+        .values_list("id", f"{target}_id", "article_id")
+    )
+    model.objects.filter(
+        pk__in=[post_id for post_id, _, _ in pending_posts_list],
+        status=PostStatus.PENDING,
+    ).update(
+        status=PostStatus.PROCESSING,
+        task_id="",
+        processing_started_at=timezone.now(),
+    )
+
+    article_ids_dict: dict[int, list[int]] = defaultdict(list)
+    for _, target_id, article_id in pending_posts_list:
+        article_ids_dict[target_id].append(article_id)
+    return article_ids_dict
+
+
+def release_stale_posts(model: type[models.Model]) -> int:
+    """
+    Put back to pending the posts of the given model processed for longer
+    than settings.POST_PROCESSING_TIMEOUT, whose task was lost, e.g. along
+    with its worker. A task that was only delayed finds its post claimed by
+    the next one and stops. Return the number of released posts.
+    """
+
+    return (
+        model.objects.filter(status=PostStatus.PROCESSING)
+        .filter(
+            Q(
+                processing_started_at__lt=timezone.now()
+                - timedelta(seconds=settings.POST_PROCESSING_TIMEOUT)
             )
-            media_response_dict: dict = json.loads(media_request.text)
-
-            if "error" in media_response_dict.keys():
-                raise Exception(container_response_dict.get("error").get("message"))
-            else:
-                InstagramPost.objects.create(
-                    article=article,
-                    profile=instagram_profile,
-                    post_date=timezone.now(),
-                    post_id=media_response_dict.get("id"),
-                )
-                article.is_instagram = True
-                article.save()
-                logger.info("Instagram post successfully created.")
+            | Q(processing_started_at__isnull=True)
+        )
+        .update(status=PostStatus.PENDING, task_id="")
+    )
 
 
-@shared_task
+def expire_old_posts(model: type[models.Model], today: date) -> int:
+    """
+    Fail the pending posts of the given model whose articles are older than
+    settings.POST_MAX_AGE_DAYS, so a page or profile reset after days broken
+    doesn't publish old news. Return the number of expired posts.
+    """
+
+    return model.objects.filter(
+        status=PostStatus.PENDING, article__post_date__lt=get_oldest_post_date(today)
+    ).update(
+        status=PostStatus.FAILED,
+        error="Expired: the article is too old to be published.",
+    )
+
+
+@shared_task(ignore_result=True)
 def auto_create_posts_task() -> None:
-    facebook_pages_list: list[FacebookPage] = FacebookPage.objects.all()
-    instagram_profiles_list: list[InstagramProfile] = InstagramProfile.objects.all()
-    not_posted_articles_list: list[Article] = Article.objects.filter(
-        post_date=timezone.now().date()
-    ).filter(is_facebook=False, is_instagram=False)
-    if not_posted_articles_list.exists():
-        for facebook_page in facebook_pages_list:
-            for article in not_posted_articles_list:
-                create_facebook_post_task.delay(article.id, facebook_page.id)
-        for instagram_profile in instagram_profiles_list:
-            for article in not_posted_articles_list:
-                create_instagram_post_task.delay(article.id, instagram_profile.id)
+    """
+    Queue the posts of today's articles, release the posts left processing by
+    lost tasks, expire the ones of old articles and dispatch every pending
+    post.
+    """
+
+    today: date = timezone.now().date()
+    enqueue_posts(today)
+    for model in (FacebookPost, InstagramPost):
+        released: int = release_stale_posts(model)
+        if released:
+            logger.warning(f"Released {released} stale {model.__name__} instances.")
+        expired: int = expire_old_posts(model, today)
+        if expired:
+            logger.warning(f"Expired {expired} old {model.__name__} instances.")
+
+    signatures_list: list = []
+    for facebook_page_id, article_ids_list in take_pending_posts(
+        FacebookPost, "page", today
+    ).items():
+        if settings.FACEBOOK_BATCH_PUBLISHING:
+            signatures_list += [
+                create_facebook_posts_batch_task.s(article_ids_chunk, facebook_page_id)
+                for article_ids_chunk in get_chunks(
+                    article_ids_list, GRAPH_API_BATCH_SIZE
+                )
+            ]
+        else:
+            signatures_list += get_chunk_signatures(
+                create_facebook_post_task, article_ids_list, facebook_page_id
+            )
+    for instagram_profile_id, article_ids_list in take_pending_posts(
+        InstagramPost, "profile", today
+    ).items():
+        signatures_list += get_chunk_signatures(
+            create_instagram_post_task, article_ids_list, instagram_profile_id
+        )
+    if signatures_list:
+        group(signatures_list).apply_async()
+
+
+@shared_task(ignore_result=True)
+def compact_task_results_task() -> None:
+    """
+    Roll the task results older than the retention window up into
+    :model:`scraper.TaskResultDailySummary` instances and delete them.
+    """
+
+    total_deleted: int = compact_task_results(
+        timezone.now() - timedelta(days=settings.TASK_RESULT_RETENTION_DAYS)
+    )
+    logger.info(f"Compacted {total_deleted} task results.")
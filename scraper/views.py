@@ -0,0 +1,23 @@
+import hmac
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+
+from scraper import metrics
+
+
+def metrics_view(request) -> HttpResponse:
+    """
+    Expose the scraping and publishing metrics in the Prometheus text format,
+    only to requests bearing settings.METRICS_TOKEN.
+    """
+
+    authorization: str = request.headers.get("Authorization", "")
+    if not settings.METRICS_TOKEN or not hmac.compare_digest(
+        authorization.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()
+    ):
+        raise PermissionDenied
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )